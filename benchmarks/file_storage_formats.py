@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Reload time and file size of FileStorage snapshots in the JSON and
+binary formats
+
+Usage: ./benchmarks/file_storage_formats.py [count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def main(count):
+    """Runs the benchmark on count Places"""
+    for i in range(count):
+        place = Place()
+        place.name = "Place {}".format(i)
+        place.city_id = "city-{}".format(i % 100)
+        place.number_rooms = i % 5
+        place.price_by_night = 50 + i % 300
+        place.latitude = 37.0 + i / count
+        place.longitude = -122.0 - i / count
+    for fmt, path in (('json', 'file.json'), ('binary', 'file.hbnb')):
+        storage.format = fmt
+        storage.save()
+        storage.all().clear()
+        start = time.perf_counter()
+        storage.reload()
+        elapsed = time.perf_counter() - start
+        print("{:6} reload: {:7.3f} s  size: {:8.1f} MiB".format(
+            fmt, elapsed, os.path.getsize(path) / 2 ** 20))
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
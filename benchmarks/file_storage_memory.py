@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Peak extra memory of FileStorage save and reload, with and without
+streaming
+
+Usage: ./benchmarks/file_storage_memory.py [count]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def measure(func):
+    """Returns the peak memory allocated by func beyond what it keeps"""
+    tracemalloc.start()
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - current
+
+
+def main(count):
+    """Runs the benchmark on count Reviews"""
+    for i in range(count):
+        Review().text = "Review number {}".format(i)
+    for stream in (False, True):
+        storage.stream = stream
+        saved = measure(storage.save)
+        storage.all().clear()
+        loaded = measure(storage.reload)
+        print("stream={!s:5} save: {:8.1f} MiB  reload: {:8.1f} MiB".format(
+            stream, saved / 2 ** 20, loaded / 2 ** 20))
+    os.remove('file.json')
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""Bytes per model instance, measured with tracemalloc
+
+Usage: ./benchmarks/model_memory.py [count]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models.place import Place  # noqa: E402
+from models.review import Review  # noqa: E402
+from models.state import State  # noqa: E402
+
+record = {'id': '', '__class__': '',
+          'created_at': '2024-01-01T10:00:00.000001',
+          'updated_at': '2024-01-01T10:00:00.000001'}
+samples = {
+    State: {'name': 'California'},
+    Review: {'place_id': 'p', 'user_id': 'u', 'text': 'Great stay'},
+    Place: {'city_id': 'c', 'user_id': 'u', 'name': 'Loft',
+            'number_rooms': 2, 'price_by_night': 120, 'latitude': 37.7,
+            'longitude': -122.4},
+}
+
+
+def main(count):
+    """Builds count objects of each class and prints their average size"""
+    for cls, attrs in samples.items():
+        kwargs = [dict(record, id=str(i), **attrs) for i in range(count)]
+        tracemalloc.start()
+        objs = [cls(**kw) for kw in kwargs]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("{:8} {:6.0f} bytes/object".format(cls.__name__,
+                                                 size / len(objs)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
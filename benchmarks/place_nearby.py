@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Nearby place queries through the grid index versus a brute-force
+haversine scan
+
+Usage: ./benchmarks/place_nearby.py [places]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.engine.geo_index import haversine  # noqa: E402
+from models.place import Place  # noqa: E402
+
+
+def brute_force(lat, lon, radius_km, limit):
+    """Measures the distance to every Place"""
+    found = []
+    for place in storage.all(Place).values():
+        distance = haversine(lat, lon, place.latitude, place.longitude)
+        if distance <= radius_km:
+            found.append((distance, place))
+    found.sort(key=lambda pair: pair[0])
+    return found[:limit]
+
+
+def timed(label, func, *args):
+    """Prints the time of func(*args) and returns its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:38} {:9.2f} ms  {:5} places".format(
+        label, (time.perf_counter() - start) * 1e3, len(result)))
+    return result
+
+
+def main(count):
+    """Runs the benchmark on count Places spread over the US"""
+    rng = random.Random(0)
+    record = Place().to_dict()
+    storage.bulk_new(Place(**dict(
+        record, id='place-{:07}'.format(i),
+        latitude=rng.uniform(25.0, 49.0),
+        longitude=rng.uniform(-124.0, -67.0))) for i in range(count))
+    timed("index build (first query)", storage.nearby, 0.0, 0.0, 1)
+    for radius, limit in ((1, 20), (10, 20), (50, 100)):
+        label = "{} km, top {}".format(radius, limit)
+        expected = timed("brute force: " + label, brute_force, 37.77,
+                         -122.42, radius, limit)
+        found = timed("grid:        " + label, storage.nearby, 37.77,
+                      -122.42, radius, limit)
+        assert [p for d, p in found] == [p for d, p in expected]
+    place = storage.get(Place, 'place-0000000')
+    start = time.perf_counter()
+    for i in range(1000):
+        place.latitude += 0.01 if i % 2 else -0.01
+        storage.new(place)
+    print("{:38} {:9.4f} ms".format("index update per write",
+                                    time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Place search through the amenity bitsets versus a naive scan
+
+Usage: ./benchmarks/place_search.py [places]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.place import Place  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def naive(states, cities, amenities):
+    """Scans every Place and its amenity_ids"""
+    city_ids = set(cities)
+    for city in storage.all(City).values():
+        if city.state_id in states:
+            city_ids.add(city.id)
+    return sorted((place for place in storage.all(Place).values()
+                   if (not city_ids or place.city_id in city_ids) and
+                   all(a in place.amenity_ids for a in amenities)),
+                  key=lambda place: place.id)
+
+
+def timed(label, func, *args):
+    """Prints the time of func(*args) and returns its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:44} {:9.2f} ms  {:7} places".format(
+        label, (time.perf_counter() - start) * 1e3, len(result)))
+    return result
+
+
+def main(count):
+    """Runs the benchmark on count Places"""
+    rng = random.Random(0)
+    amenities = ['amenity-{}'.format(i) for i in range(30)]
+    states = [State() for _ in range(50)]
+    cities = []
+    for i in range(1000):
+        city = City()
+        city.state_id = states[i % len(states)].id
+        cities.append(city)
+    record = Place().to_dict()
+    storage.bulk_new(Place(**dict(
+        record, id='place-{:07}'.format(i),
+        city_id=cities[rng.randrange(len(cities))].id,
+        amenity_ids=rng.sample(amenities, rng.randrange(1, 8))))
+        for i in range(count))
+    timed("index build (first search)", storage.search_places)
+    queries = (
+        ("2 amenities anywhere", (), (), amenities[:2]),
+        ("4 amenities anywhere", (), (), amenities[:4]),
+        ("3 states, 1 amenity", [s.id for s in states[:3]], (),
+         amenities[:1]),
+        ("20 cities, 3 amenities", (), [c.id for c in cities[:20]],
+         amenities[:3]),
+    )
+    for label, state_ids, city_ids, amenity_ids in queries:
+        expected = timed("naive scan: " + label, naive, set(state_ids),
+                         city_ids, amenity_ids)
+        found = timed("bitsets:    " + label, storage.search_places,
+                      state_ids, city_ids, amenity_ids)
+        assert found == expected
+    place = storage.get(Place, 'place-0000000')
+    start = time.perf_counter()
+    for _ in range(100):
+        place.amenity_ids.append(amenities[-1])
+        storage.new(place)
+        place.amenity_ids.pop()
+        storage.new(place)
+    print("{:44} {:9.2f} ms".format("index update per write",
+                                    (time.perf_counter() - start) * 5))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
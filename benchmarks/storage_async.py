@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""Load test of the async storage API against the blocking one
+
+Serves requests of the cities_by_states page from SQLiteStorage: one
+at a time through the blocking engine, as a single sync worker does,
+and concurrently on one event loop through AsyncStorage.
+
+Usage: ./benchmarks/storage_async.py [requests] [concurrency]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+os.environ['HBNB_SQLITE_PATH'] = 'hbnb.db'
+
+from models.city import City  # noqa: E402
+from models.engine.async_storage import AsyncStorage  # noqa: E402
+from models.engine.sqlite_storage import SQLiteStorage  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def page(storage):
+    """One request of the cities_by_states page, blocking"""
+    states = list(storage.query(State, order_by='name', load=['cities']))
+    storage.close()
+    return states
+
+
+async def async_page(storage):
+    """One request of the cities_by_states page, async"""
+    states = await storage.query(State, order_by='name', load=['cities'])
+    await storage.close()
+    return states
+
+
+async def load(storage, requests, concurrency):
+    """Serves requests with at most concurrency of them in flight"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def request():
+        async with slots:
+            await async_page(storage)
+    await asyncio.gather(*(request() for _ in range(requests)))
+
+
+def main(requests, concurrency):
+    """Runs the load test"""
+    sqlite = SQLiteStorage()
+    sqlite.reload()
+    for i in range(50):
+        state = State()
+        state.name = "State {}".format(i)
+        sqlite.new(state)
+        for j in range(20):
+            city = City()
+            city.name = "City {}".format(j)
+            city.state_id = state.id
+            sqlite.new(city)
+    sqlite.save()
+    sqlite.close()
+    start = time.perf_counter()
+    for _ in range(requests):
+        page(sqlite)
+    elapsed = time.perf_counter() - start
+    print("sync                  {:8.1f} req/s".format(requests / elapsed))
+    for workers in (1, 4):
+        storage = AsyncStorage(sqlite, workers)
+        start = time.perf_counter()
+        asyncio.run(load(storage, requests, concurrency))
+        elapsed = time.perf_counter() - start
+        print("async, {} worker(s)    {:8.1f} req/s".format(
+            workers, requests / elapsed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 32)
@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+"""Rows per second written one object at a time versus with bulk_new
+
+Runs against the engine selected by HBNB_TYPE_STORAGE: FileStorage, or
+SQLiteStorage with HBNB_TYPE_STORAGE=sqlite.
+
+Usage: ./benchmarks/storage_bulk.py [count]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+record = {'__class__': 'Review', 'place_id': 'p', 'user_id': 'u',
+          'text': 'Great stay', 'created_at': '2024-01-01T10:00:00.000001',
+          'updated_at': '2024-01-01T10:00:00.000001'}
+
+
+def reviews(count):
+    """Builds count Reviews without registering them"""
+    return [Review(**dict(record, id=str(uuid.uuid4())))
+            for _ in range(count)]
+
+
+def main(count):
+    """Writes count Reviews through both paths"""
+    objs = reviews(count)
+    start = time.perf_counter()
+    for obj in objs:
+        storage.new(obj)
+        storage.save()
+    single = count / (time.perf_counter() - start)
+    objs = reviews(count)
+    start = time.perf_counter()
+    storage.bulk_new(objs)
+    storage.save()
+    bulk = count / (time.perf_counter() - start)
+    print("{}: new+save {:10.0f} rows/s  bulk_new {:10.0f} rows/s".format(
+        type(storage).__name__, single, bulk))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+"""Point lookups and counts through get()/count() versus all()
+
+Usage: ./benchmarks/storage_lookup.py [count per class]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+os.environ['HBNB_SQLITE_PATH'] = 'hbnb.db'
+
+from models import storage  # noqa: E402
+from models.engine.file_storage import classes  # noqa: E402
+from models.engine.sqlite_storage import SQLiteStorage  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def timed(label, func, repeat):
+    """Prints the average time of func over repeat calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    print("{:40} {:12.1f} us".format(
+        label, (time.perf_counter() - start) / repeat * 1e6))
+
+
+def main(count):
+    """Runs the benchmark on count objects of each class"""
+    sqlite = SQLiteStorage()
+    sqlite.reload()
+    for name, cls in classes.items():
+        if name != 'BaseModel':
+            for _ in range(count):
+                sqlite.new(cls())
+    sqlite.save()
+    sqlite.close()
+    state_id = next(iter(storage.all(State).values())).id
+    for label, engine in (('FileStorage', storage), ('SQLiteStorage', sqlite)):
+        timed(label + " all(State)[key]",
+              lambda: engine.all(State).get('State.' + state_id), 5)
+        timed(label + " get(State, id)",
+              lambda: engine.get(State, state_id), 1000)
+        timed(label + " len(all(State))",
+              lambda: len(engine.all(State)), 5)
+        timed(label + " count(State)", lambda: engine.count(State), 100)
+        timed(label + " len(all())", lambda: len(engine.all()), 5)
+        timed(label + " count()", lambda: engine.count(), 100)
+        sqlite.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""Requests per second of the cities_by_states page with and without the
+HTTP cache
+
+Uncached pages are rendered on every request, cached ones come from the
+HTML rendered for the current storage version, and conditional ones are
+answered 304 from their ETag.
+
+Usage: ./benchmarks/web_cache.py [states] [requests]
+"""
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.state import State  # noqa: E402
+from web_flask import http_cache  # noqa: E402
+
+
+def timed(label, client, requests, headers=None):
+    """Prints the requests per second of GET /cities_by_states"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        status = client.get('/cities_by_states', headers=headers).status_code
+    print("{:12} {:5} {:10.1f} req/s".format(
+        label, status, requests / (time.perf_counter() - start)))
+
+
+def main(states, requests):
+    """Runs the benchmark on states States of 20 Cities each"""
+    for i in range(states):
+        state = State()
+        state.name = "State {}".format(i)
+        for j in range(20):
+            city = City()
+            city.name = "City {}".format(j)
+            city.state_id = state.id
+    storage.save()
+    app = importlib.import_module('web_flask.8-cities_by_states').app
+    client = app.test_client()
+    http_cache.enabled = False
+    timed("uncached", client, requests)
+    http_cache.enabled = True
+    etag = client.get('/cities_by_states').headers['ETag']
+    timed("cached", client, requests)
+    timed("conditional", client, requests, {'If-None-Match': etag})
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Requests per second of the pre-fork server by number of workers
+
+For each worker count the server is started on its own, then client
+processes request the cities_by_states page for a few seconds, a new
+connection per request. The HTTP cache is off, so every request renders
+the page.
+
+Usage: ./benchmarks/web_prefork.py [states] [seconds] [workers...]
+"""
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, root)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.state import State  # noqa: E402
+
+port = 5077
+clients = 8
+
+
+def client(seconds):
+    """Returns the number of pages fetched in seconds"""
+    done = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('GET', '/cities_by_states')
+        conn.getresponse().read()
+        conn.close()
+        done += 1
+    return done
+
+
+def wait_for_port():
+    """Waits until the server accepts connections"""
+    for _ in range(300):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("the server did not start")
+
+
+def measure(workers, seconds):
+    """Prints the requests per second of workers workers"""
+    env = dict(os.environ, PYTHONPATH=root, HBNB_HTTP_CACHE='0')
+    server = subprocess.Popen([sys.executable, '-m', 'web_flask.prefork',
+                               str(workers), str(port)], env=env)
+    try:
+        wait_for_port()
+        client(0.5)
+        with multiprocessing.Pool(clients) as pool:
+            done = sum(pool.map(client, [seconds] * clients))
+        print("{:3} workers {:10.1f} req/s".format(workers, done / seconds))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def main(states, seconds, counts):
+    """Runs the benchmark on states States of 20 Cities each"""
+    for i in range(states):
+        state = State()
+        state.name = "State {}".format(i)
+        for j in range(20):
+            city = City()
+            city.name = "City {}".format(j)
+            city.state_id = state.id
+    storage.save()
+    for workers in counts:
+        measure(workers, seconds)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 5,
+         [int(n) for n in sys.argv[3:]] or [1, 2, 4])
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Time to first byte and peak memory of the cities_by_states page,
+rendered whole or streamed
+
+The whole page is rendered with render_template before anything is
+sent; the streamed one is the page served by the app, sent in chunks as
+the template walks the states. Memory is the tracemalloc peak during
+the request, the HTTP cache being off.
+
+Usage: ./benchmarks/web_stream.py [states] [requests]
+"""
+import importlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__),
+                                                '..')))
+os.chdir(tempfile.mkdtemp())
+
+from flask import render_template  # noqa: E402
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.state import State  # noqa: E402
+from web_flask import http_cache  # noqa: E402
+
+
+def measure(label, client, path, requests):
+    """Prints the mean TTFB, total time and peak memory of GET path"""
+    first = total = peak = 0
+    client.get(path).close()
+    for _ in range(requests):
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = client.get(path, buffered=False)
+        chunks = iter(response.response)
+        size = len(next(chunks, b''))
+        first += time.perf_counter() - start
+        for chunk in chunks:
+            size += len(chunk)
+        response.close()
+        total += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    print("{:8} {:9.2f} ms TTFB {:9.2f} ms total {:9.1f} KiB peak "
+          "{:9.1f} KiB page".format(label, first * 1000 / requests,
+                                    total * 1000 / requests, peak / 1024,
+                                    size / 1024))
+
+
+def main(states, requests):
+    """Runs the benchmark on states States of 20 Cities each"""
+    for i in range(states):
+        state = State()
+        state.name = "State {}".format(i)
+        for j in range(20):
+            city = City()
+            city.name = "City {}".format(j)
+            city.state_id = state.id
+    storage.save()
+    app = importlib.import_module('web_flask.8-cities_by_states').app
+
+    @app.route('/cities_by_states_whole')
+    def whole():
+        """The page as it was rendered before streaming"""
+        return render_template('8-cities_by_states.html',
+                               states=storage.query(State, order_by='name'))
+
+    http_cache.enabled = False
+    client = app.test_client()
+    measure("whole", client, '/cities_by_states_whole', requests)
+    measure("streamed", client, '/cities_by_states', requests)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10)
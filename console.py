@@ -1,7 +1,12 @@
 #!/usr/bin/python3
 """Console module for HBNB project"""
 import cmd
+import csv
+import json
 import shlex
+import time
+import uuid
+from datetime import datetime
 from models import storage
 from models.base_model import BaseModel
 from models.user import User
@@ -12,6 +17,50 @@ from models.amenity import Amenity
 from models.review import Review
 
 
+def coerce(value):
+    """Returns value as an int or a float if it reads as one; raises
+    ValueError if it looks like a number but is not one"""
+    if value.isdigit():
+        return int(value)
+    if '.' in value and value.replace('.', '').isdigit():
+        return float(value)
+    return value
+
+
+def read_records(f, csv_format=False):
+    """Yields the records of a JSON Lines or CSV file, or None for the
+    lines that are not records
+
+    CSV values go through coerce(), and empty ones are left out. Ids,
+    the id and *_id columns, and zero-padded numbers like 0042 are kept
+    as text.
+    """
+    if csv_format:
+        for row in csv.DictReader(f):
+            record = {}
+            for key, value in row.items():
+                if not key or not value:
+                    continue
+                if (key == 'id' or key.endswith('_id') or
+                        len(value) > 1 and value.startswith('0') and
+                        value[1] != '.'):
+                    record[key] = value
+                    continue
+                try:
+                    record[key] = coerce(value)
+                except ValueError:
+                    continue
+            yield record
+        return
+    for line in f:
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+
 class HBNBCommand(cmd.Cmd):
     """HBNB console"""
     prompt = '(hbnb) '
@@ -20,6 +69,7 @@ class HBNBCommand(cmd.Cmd):
         'State': State, 'City': City, 'Amenity': Amenity,
         'Review': Review
     }
+    import_batch = 1000
 
     def do_create(self, arg):
         """Create a new instance of a class"""
@@ -36,16 +86,78 @@ class HBNBCommand(cmd.Cmd):
                 key, value = param.split('=')
                 value = value.strip('"')
                 value = value.replace('_', ' ')
-                if value.isdigit():
-                    value = int(value)
-                elif '.' in value and value.replace('.', '').isdigit():
-                    value = float(value)
-                setattr(new_instance, key, value)
+                setattr(new_instance, key, coerce(value))
             except ValueError:
                 continue
         new_instance.save()
         print(new_instance.id)
 
+    def do_import(self, arg):
+        """Import objects from a JSON Lines or CSV file, saved once
+        Usage: import <file> [<class name>]
+
+        Records name their class in __class__, or are of the class given.
+        Files ending in .csv are read as CSV with a header line.
+        """
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** file name missing **")
+            return
+        default = args[1] if len(args) > 1 else None
+        if default is not None and default not in self.classes:
+            print("** class doesn't exist **")
+            return
+        try:
+            f = open(args[0], newline='')
+        except OSError:
+            print("** file doesn't exist **")
+            return
+        start = time.perf_counter()
+        done = skipped = 0
+        batch = []
+        with f:
+            for record in read_records(f, args[0].endswith('.csv')):
+                obj = self.__build(record, default)
+                if obj is None:
+                    skipped += 1
+                    continue
+                batch.append(obj)
+                if len(batch) == self.import_batch:
+                    storage.bulk_new(batch)
+                    done += len(batch)
+                    batch = []
+                    print("{} objects imported ({:.0f} objects/s)".format(
+                        done, done / (time.perf_counter() - start)))
+        storage.bulk_new(batch)
+        done += len(batch)
+        storage.save()
+        elapsed = time.perf_counter() - start
+        print("{} objects imported in {:.2f}s ({:.0f} objects/s)".format(
+            done, elapsed, done / elapsed if elapsed else 0))
+        if skipped:
+            print("{} records skipped".format(skipped))
+
+    def __build(self, record, default=None):
+        """Returns the object of an imported record, or None if it has
+        no known class, an id that is not a string, or dates that are
+        neither ISO format strings nor datetimes"""
+        if record is None:
+            return None
+        name = record.get('__class__', default)
+        if name not in self.classes:
+            return None
+        now = datetime.now()
+        if not isinstance(record.setdefault('id', str(uuid.uuid4())), str):
+            return None
+        for key in ('created_at', 'updated_at'):
+            if not isinstance(record.setdefault(key, now), (str, datetime)):
+                return None
+        record['__class__'] = name
+        try:
+            return self.classes[name](**record)
+        except (TypeError, ValueError):
+            return None
+
     # ... (other console methods)
 
 
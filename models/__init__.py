@@ -1,7 +1,25 @@
 #!/usr/bin/python3
-"""This module instantiates an object of class FileStorage"""
-from models.engine.file_storage import FileStorage
+"""This module instantiates the storage engine selected by
+HBNB_TYPE_STORAGE: db for DBStorage, sqlite for SQLiteStorage, and
+FileStorage otherwise. With HBNB_STORAGE_CACHE=1 the engine is wrapped
+in a read-through CachedStorage"""
+from os import getenv
+from models import base_model
 
 
-storage = FileStorage()
+if getenv('HBNB_TYPE_STORAGE') == 'db':
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+elif getenv('HBNB_TYPE_STORAGE') == 'sqlite':
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
 storage.reload()
+if getenv('HBNB_STORAGE_CACHE') == '1':
+    from models.engine.cached_storage import CachedStorage
+    storage = CachedStorage(storage,
+                            maxsize=int(getenv('HBNB_CACHE_SIZE', '1024')),
+                            ttl=float(getenv('HBNB_CACHE_TTL', '60')))
+base_model.storage = storage
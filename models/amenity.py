@@ -4,4 +4,5 @@ from models.base_model import BaseModel
 
 
 class Amenity(BaseModel):
-    name = ""
+    _defaults = {'name': ""}
+    __slots__ = tuple(_defaults)
@@ -3,11 +3,42 @@
 import uuid
 from datetime import datetime
 
+# the storage told about writes to the objects it watches; models sets it
+# once the engine is built
+storage = None
+
 
 class BaseModel:
-    """A base class for all hbnb models"""
+    """A base class for all hbnb models
+
+    Models keep their declared attributes in __slots__ rather than in a
+    per-instance __dict__. Each model lists its attributes and their
+    defaults in _defaults, and attributes that were never declared go
+    to a small _extra dict created on first use.
+
+    _watched is None unless a storage keeps its indexes and journal in
+    step with the object; it then holds the foreign key fields that
+    storage indexes, and attribute writes are reported to it.
+    """
+    __slots__ = ('id', 'created_at', 'updated_at', '_extra', '_watched')
+    _defaults = {'_extra': None, '_watched': None}
+    _fields = ('id', 'created_at', 'updated_at')
+    _has_dict = False
+
+    def __init_subclass__(cls, **kwargs):
+        """Collects the slots and defaults declared along the MRO"""
+        super().__init_subclass__(**kwargs)
+        parent = cls.__mro__[1]
+        cls._defaults = dict(parent._defaults, **vars(cls).get('_defaults',
+                                                               {}))
+        cls._fields = parent._fields + tuple(
+            name for name in vars(cls).get('__slots__', ())
+            if name not in parent._fields)
+        cls._has_dict = parent._has_dict or '__slots__' not in vars(cls)
+
     def __init__(self, *args, **kwargs):
         """Instatntiates a new model"""
+        object.__setattr__(self, '_watched', None)
         if not kwargs:
             from models import storage
             self.id = str(uuid.uuid4())
@@ -15,28 +46,84 @@ class BaseModel:
             self.updated_at = datetime.now()
             storage.new(self)
         else:
-            kwargs['updated_at'] = datetime.strptime(kwargs['updated_at'],
-                                                     '%Y-%m-%dT%H:%M:%S.%f')
-            kwargs['created_at'] = datetime.strptime(kwargs['created_at'],
-                                                     '%Y-%m-%dT%H:%M:%S.%f')
+            for key in ('created_at', 'updated_at'):
+                if isinstance(kwargs[key], str):
+                    kwargs[key] = datetime.fromisoformat(kwargs[key])
             del kwargs['__class__']
-            self.__dict__.update(kwargs)
+            for key, value in kwargs.items():
+                try:
+                    object.__setattr__(self, key, value)
+                except AttributeError:
+                    self.__set_extra(key, value)
+
+    def __getattr__(self, name):
+        """Falls back on the declared default, then on extra attributes"""
+        defaults = type(self)._defaults
+        if name in defaults:
+            value = defaults[name]
+            if isinstance(value, list):
+                value = list(value)
+                object.__setattr__(self, name, value)
+            return value
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and, if the object is watched, tells storage
+        so that it writes the change, and moves the object in the index
+        of a foreign key that took another value"""
+        watched = self._watched
+        fk = watched is not None and name in watched
+        if fk:
+            old = getattr(self, name, None)
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            self.__set_extra(name, value)
+        if watched is not None:
+            if fk and old != value:
+                storage.reindex(self, name, old)
+            storage.touch(self)
+
+    def __set_extra(self, name, value):
+        """Stores an attribute that has no slot"""
+        if self._extra is None:
+            object.__setattr__(self, '_extra', {})
+        self._extra[name] = value
+
+    def __attributes(self):
+        """Returns the attributes set on the instance as a dict"""
+        attrs = {}
+        for name in type(self)._fields:
+            try:
+                attrs[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self._extra:
+            attrs.update(self._extra)
+        if type(self)._has_dict:
+            attrs.update(self.__dict__)
+        return attrs
 
     def __str__(self):
         """Returns a string representation of the instance"""
         cls = (str(type(self)).split('.')[-1]).split('\'')[0]
-        return '[{}] ({}) {}'.format(cls, self.id, self.__dict__)
+        return '[{}] ({}) {}'.format(cls, self.id, self.__attributes())
 
     def save(self):
         """Updates updated_at with current time when instance is changed"""
         from models import storage
         self.updated_at = datetime.now()
+        storage.new(self)
         storage.save()
 
     def to_dict(self):
         """Convert instance into dict format"""
         dictionary = {}
-        dictionary.update(self.__dict__)
+        dictionary.update(self.__attributes())
         dictionary.update({'__class__':
                           (str(type(self)).split('.')[-1]).split('\'')[0]})
         dictionary['created_at'] = self.created_at.isoformat()
@@ -5,5 +5,12 @@ from models.base_model import BaseModel
 
 class City(BaseModel):
     """ The city class, contains state ID and nam """
-    state_id = ""
-    name = ""
+    _defaults = {'state_id': "", 'name': ""}
+    __slots__ = tuple(_defaults)
+
+    @property
+    def places(self):
+        """ List of the Place objects of this City """
+        from models import storage
+        from models.place import Place
+        return list(storage.by_fk(Place, 'city_id', self.id).values())
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""This module defines an asyncio front for the blocking storage engines"""
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import getenv
+
+
+class AsyncStorage:
+    """Runs the calls of a blocking storage engine in worker threads
+
+    Every method is a coroutine, so an event loop can serve other
+    requests while a call waits on disk or on SQLite. Reads are spread
+    over worker threads. Writes all go to one more thread, so that
+    engines keeping a session per thread, like SQLiteStorage, see new,
+    delete and save in the same session. That session is shared by every
+    request, so close() leaves it open while it holds unsaved writes.
+    """
+
+    def __init__(self, storage, workers=4):
+        """Instantiate an AsyncStorage object around storage"""
+        self.storage = storage
+        self.__readers = [ThreadPoolExecutor(1) for _ in range(workers)]
+        self.__writer = ThreadPoolExecutor(1)
+        self.__next = itertools.cycle(self.__readers)
+        self.__unsaved = 0
+
+    async def all(self, cls=None, load=None):
+        """Awaitable all()"""
+        return await self.__read(self.storage.all, cls, load)
+
+    async def get(self, cls, id):
+        """Awaitable get()"""
+        return await self.__read(self.storage.get, cls, id)
+
+    async def get_many(self, cls, ids):
+        """Awaitable get_many()"""
+        return await self.__read(self.storage.get_many, cls, list(ids))
+
+    async def count(self, cls=None):
+        """Awaitable count()"""
+        return await self.__read(self.storage.count, cls)
+
+    async def by_fk(self, cls, field, value):
+        """Awaitable by_fk()"""
+        return await self.__read(self.storage.by_fk, cls, field, value)
+
+    async def page(self, cls, limit, after=None):
+        """Awaitable page()"""
+        return await self.__read(self.storage.page, cls, limit, after)
+
+    async def nearby(self, lat, lon, radius_km, limit=None):
+        """Awaitable nearby()"""
+        return await self.__read(self.storage.nearby, lat, lon, radius_km,
+                                 limit)
+
+    async def range_places(self, ranges=None, cities=(), order_by=None,
+                           limit=None):
+        """Awaitable range_places()"""
+        return await self.__read(self.storage.range_places, ranges,
+                                 list(cities), order_by, limit)
+
+    async def search_places(self, states=(), cities=(), amenities=()):
+        """Awaitable search_places()"""
+        return await self.__read(self.storage.search_places, list(states),
+                                 list(cities), list(amenities))
+
+    async def query(self, cls, filters=None, order_by=None, limit=None,
+                    offset=0, load=None):
+        """Awaitable query(), returning the list of the matches"""
+        return await self.__read(lambda: list(self.storage.query(
+            cls, filters, order_by, limit, offset, load=load)))
+
+    async def new(self, obj):
+        """Awaitable new()"""
+        await self.__write(self.__stage, self.storage.new, obj)
+
+    async def delete(self, obj=None):
+        """Awaitable delete()"""
+        await self.__write(self.__stage, self.storage.delete, obj)
+
+    async def save(self):
+        """Awaitable save()"""
+        await self.__write(self.__save)
+
+    async def reload(self):
+        """Awaitable reload()"""
+        await self.__write(self.storage.reload)
+
+    async def close(self):
+        """Closes the read sessions, and the write session unless it holds
+        writes not saved yet"""
+        await asyncio.gather(self.__write(self.__close_writer),
+                             *(self.__run(reader, self.storage.close)
+                               for reader in self.__readers))
+
+    async def run(self, func, *args):
+        """Runs func(storage, *args) in the write thread, for a unit of
+        work that needs a single session"""
+        return await self.__write(func, self.storage, *args)
+
+    def __stage(self, func, *args):
+        """Runs a write to be saved later, in the writer thread"""
+        func(*args)
+        self.__unsaved += 1
+
+    def __save(self):
+        """Saves the write session, in the writer thread"""
+        self.storage.save()
+        self.__unsaved = 0
+
+    def __close_writer(self):
+        """Closes the write session if nothing in it awaits a save, in
+        the writer thread"""
+        if not self.__unsaved:
+            self.storage.close()
+
+    def __read(self, func, *args):
+        """Runs a read in the next reader thread"""
+        return self.__run(next(self.__next), func, *args)
+
+    def __write(self, func, *args):
+        """Runs a write in the writer thread"""
+        return self.__run(self.__writer, func, *args)
+
+    @staticmethod
+    def __run(executor, func, *args):
+        """Returns a future of func(*args) run by executor"""
+        return asyncio.get_running_loop().run_in_executor(
+            executor, partial(func, *args))
+
+
+def open_storage():
+    """Returns the storage selected by HBNB_TYPE_STORAGE in an
+    AsyncStorage"""
+    from models import storage
+    return AsyncStorage(storage, int(getenv('HBNB_ASYNC_WORKERS', '4')))
@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+"""Compact binary snapshot format for FileStorage
+
+A snapshot starts with the magic b'HBNB', a format version and the
+number of classes. Each class section holds its name, its row count
+and one column per attribute. Integer and float columns are stored as
+fixed-width arrays, created_at/updated_at as epoch microseconds, string
+columns as one UTF-8 blob plus lengths, and anything else as JSON text.
+
+Usage: python3 -m models.engine.binary_format <source> <destination>
+converts file.json to the binary format, or back when the source is
+already binary.
+"""
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+
+MAGIC = b'HBNB'
+VERSION = 1
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_MISSING = object()
+_swap = sys.byteorder == 'big'
+
+
+def is_binary(path):
+    """Tells whether the file at path starts with the binary magic"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+def dump(records, f):
+    """Writes records, a dict of class name to list of to_dict() dicts,
+    to the binary file f; classes without records are left out"""
+    records = {name: rows for name, rows in records.items() if rows}
+    f.write(MAGIC + struct.pack('<HI', VERSION, len(records)))
+    for name, rows in records.items():
+        columns = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        columns.pop('__class__', None)
+        _write_str(f, name)
+        f.write(struct.pack('<IH', len(rows), len(columns)))
+        for col in columns:
+            values = [row.get(col, _MISSING) for row in rows]
+            kind = _kind(col, values)
+            _write_str(f, col)
+            f.write(kind.encode())
+            _write_column(f, kind, values)
+
+
+def load(f):
+    """Yields the (key, record) pairs stored in the binary file f"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Not a binary HBNB snapshot')
+    version, count = struct.unpack('<HI', f.read(6))
+    if version != VERSION:
+        raise ValueError('Unsupported snapshot version {}'.format(version))
+    for _ in range(count):
+        name = _read_str(f)
+        rows, ncols = struct.unpack('<IH', f.read(6))
+        names, columns, sparse = [], [], []
+        for _ in range(ncols):
+            col = _read_str(f)
+            kind = f.read(1).decode()
+            names.append(col)
+            columns.append(_read_column(f, kind, rows))
+            if kind == 'j':
+                sparse.append(col)
+        if not rows:
+            continue
+        keys = map((name + '.').__add__, columns[names.index('id')])
+        names.append('__class__')
+        columns.append(repeat(name))
+        records = map(dict, map(zip, repeat(names), zip(*columns)))
+        if not sparse:
+            yield from zip(keys, records)
+            continue
+        for key, record in zip(keys, records):
+            for col in sparse:
+                if record[col] is _MISSING:
+                    del record[col]
+            yield key, record
+
+
+def _kind(col, values):
+    """Picks the storage kind of a column"""
+    types = set(map(type, values))
+    if types == {int} and all(-2 ** 63 <= v < 2 ** 63 for v in values):
+        return 'q'
+    if types == {float}:
+        return 'd'
+    if col in ('created_at', 'updated_at') and types <= {str, datetime}:
+        try:
+            for v in values:
+                if isinstance(v, str):
+                    datetime.fromisoformat(v)
+            return 't'
+        except ValueError:
+            pass
+    if types == {str}:
+        return 's'
+    return 'j'
+
+
+def _write_str(f, text):
+    """Writes a length-prefixed UTF-8 string"""
+    data = text.encode()
+    f.write(struct.pack('<H', len(data)) + data)
+
+
+def _read_str(f):
+    """Reads a length-prefixed UTF-8 string"""
+    size, = struct.unpack('<H', f.read(2))
+    return f.read(size).decode()
+
+
+def _write_array(f, values):
+    """Writes a little-endian array"""
+    if _swap:
+        values.byteswap()
+    f.write(values.tobytes())
+
+
+def _read_array(f, code, count):
+    """Reads a little-endian array of count items"""
+    values = array(code)
+    values.frombytes(f.read(values.itemsize * count))
+    if _swap:
+        values.byteswap()
+    return values
+
+
+def _write_column(f, kind, values):
+    """Writes the payload of a column"""
+    if kind in 'qd':
+        _write_array(f, array(kind, values))
+    elif kind == 't':
+        stamps = [datetime.fromisoformat(v) if isinstance(v, str) else v
+                  for v in values]
+        _write_array(f, array('q', [(v - _EPOCH) // _MICROSECOND
+                                    for v in stamps]))
+    else:
+        if kind == 'j':
+            values = ['' if v is _MISSING else json.dumps(v, default=str)
+                      for v in values]
+        blob = ''.join(values).encode()
+        _write_array(f, array('I', map(len, values)))
+        f.write(struct.pack('<I', len(blob)) + blob)
+
+
+def _read_column(f, kind, count):
+    """Reads the payload of a column as a list of values"""
+    if kind in 'qd':
+        return _read_array(f, kind, count).tolist()
+    if kind == 't':
+        return list(map(_EPOCH.__add__, map(
+            timedelta, repeat(0), repeat(0), _read_array(f, 'q', count))))
+    lengths = _read_array(f, 'I', count)
+    size, = struct.unpack('<I', f.read(4))
+    text = f.read(size).decode()
+    ends = list(accumulate(lengths))
+    values = list(map(text.__getitem__, map(slice, [0] + ends, ends)))
+    if kind == 'j':
+        return [json.loads(v) if v else _MISSING for v in values]
+    return values
+
+
+def convert(source, destination):
+    """Converts a snapshot between the JSON and the binary formats"""
+    if is_binary(source):
+        with open(source, 'rb') as f:
+            records = dict(load(f))
+        with open(destination, 'w') as f:
+            json.dump(records, f, default=datetime.isoformat)
+        return
+    with open(source, 'r') as f:
+        objs = json.load(f)
+    records = {}
+    for record in objs.values():
+        records.setdefault(record['__class__'], []).append(record)
+    with open(destination, 'wb') as f:
+        dump(records, f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+"""This module defines a read-through cache in front of a storage engine"""
+import threading
+import time
+from collections import OrderedDict
+from models.engine.file_storage import classes
+
+
+class CachedStorage:
+    """Process-local LRU cache wrapped around a storage engine
+
+    The results of all, get, get_many, count, by_fk, page and query are
+    kept for at most ttl seconds, and at most maxsize of them at once.
+    Every new, delete, save and foreign key update made through the
+    storage API drops the entries of the classes it touches, and
+    reload, or a close after which the engine's version changed, drops
+    them all. Anything else is passed through to the wrapped engine.
+    """
+
+    def __init__(self, storage, maxsize=1024, ttl=60):
+        """Instantiate a CachedStorage object around storage"""
+        self.__storage = storage
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+        self.__tagged = {}
+        self.__dirty = set()
+        self.__generation = 0
+        self.__version = getattr(storage, 'version', None)
+        self.__lock = threading.Lock()
+
+    def __getattr__(self, name):
+        """Delegates everything that is not cached to the storage"""
+        return getattr(self.__storage, name)
+
+    def all(self, cls=None, load=None):
+        """Cached all()"""
+        if load:
+            return self.__cached(('all', cls, tuple(load)), cls,
+                                 self.__storage.all, cls, load)
+        return self.__cached(('all', cls), cls, self.__storage.all, cls)
+
+    def get(self, cls, id):
+        """Cached get()"""
+        return self.__cached(('get', cls, id), cls, self.__storage.get,
+                             cls, id)
+
+    def get_many(self, cls, ids):
+        """Cached get_many()"""
+        ids = tuple(ids)
+        return self.__cached(('get_many', cls, ids), cls,
+                             self.__storage.get_many, cls, ids)
+
+    def count(self, cls=None):
+        """Cached count()"""
+        return self.__cached(('count', cls), cls, self.__storage.count, cls)
+
+    def by_fk(self, cls, field, value):
+        """Cached by_fk()"""
+        return self.__cached(('by_fk', cls, field, value), cls,
+                             self.__storage.by_fk, cls, field, value)
+
+    def page(self, cls, limit, after=None):
+        """Cached page()"""
+        return self.__cached(('page', cls, limit, after), cls,
+                             self.__storage.page, cls, limit, after)
+
+    def query(self, cls, filters=None, order_by=None, limit=None,
+              offset=0, batch_size=1000, load=None):
+        """Cached query(), replayed from a list of the results"""
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        key = ('query', cls, tuple(sorted((filters or {}).items())),
+               tuple(order_by or ()), limit, offset, tuple(load or ()))
+        return iter(self.__cached(key, cls, lambda: list(
+            self.__storage.query(cls, filters, order_by, limit, offset,
+                                 batch_size, load))))
+
+    def new(self, obj):
+        """Adds obj to the storage and drops the entries of its class"""
+        self.__storage.new(obj)
+        self.__touch(type(obj))
+
+    def bulk_new(self, objs):
+        """Adds objs to the storage and drops the entries of their classes"""
+        objs = list(objs)
+        self.__storage.bulk_new(objs)
+        for cls in set(map(type, objs)):
+            self.__touch(cls)
+
+    def delete(self, obj=None):
+        """Deletes obj from the storage and drops the entries of its class"""
+        self.__storage.delete(obj)
+        if obj is not None:
+            self.__touch(type(obj))
+
+    def bulk_delete(self, objs):
+        """Deletes objs and drops the entries of their classes"""
+        objs = list(objs)
+        self.__storage.bulk_delete(objs)
+        for cls in set(map(type, objs)):
+            self.__touch(cls)
+
+    def reindex(self, obj, field, old):
+        """Forwards a foreign key update and drops the class entries"""
+        reindex = getattr(self.__storage, 'reindex', None)
+        if reindex is not None:
+            reindex(obj, field, old)
+        self.__touch(type(obj))
+
+    def touch(self, obj):
+        """Forwards an attribute update; the entries of its class are
+        dropped at the next save. Takes no lock, as adding to a set is
+        atomic"""
+        touch = getattr(self.__storage, 'touch', None)
+        if touch is not None:
+            touch(obj)
+        self.__dirty.add(type(obj).__name__)
+
+    def save(self):
+        """Saves the storage and drops the entries changed since the
+        last save"""
+        self.__storage.save()
+        with self.__lock:
+            dirty, self.__dirty = self.__dirty, set()
+        for name in list(dirty):
+            self.__invalidate(name)
+
+    def reload(self):
+        """Reloads the storage and empties the cache"""
+        self.__storage.reload()
+        self.clear()
+
+    def close(self):
+        """Closes the storage, and empties the cache if the storage saw
+        changes, such as writes from other processes picked up by a
+        reload"""
+        self.__storage.close()
+        version = getattr(self.__storage, 'version', None)
+        if version != self.__version:
+            self.clear()
+
+    def clear(self):
+        """Empties the cache"""
+        with self.__lock:
+            self.__entries.clear()
+            self.__tagged.clear()
+            self.__generation += 1
+            self.__version = getattr(self.__storage, 'version', None)
+
+    def __cached(self, key, cls, func, *args):
+        """Returns the cached result for key, or calls func(*args)"""
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self.__generation
+        value = func(*args)
+        with self.__lock:
+            if self.__generation != generation:
+                return value
+            self.__entries[key] = (now + self.ttl, value)
+            self.__entries.move_to_end(key)
+            for name in self.__names(cls):
+                self.__tagged.setdefault(name, set()).add(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+        return value
+
+    def __touch(self, cls):
+        """Drops the entries of cls now and again at the next save"""
+        with self.__lock:
+            self.__dirty.add(cls.__name__)
+        self.__invalidate(cls.__name__)
+
+    def __invalidate(self, name):
+        """Drops every entry that involves the class called name"""
+        with self.__lock:
+            self.__generation += 1
+            for key in self.__tagged.pop(name, ()):
+                self.__entries.pop(key, None)
+
+    @staticmethod
+    def __names(cls):
+        """Returns the class names an entry for cls depends on"""
+        if cls is None:
+            return list(classes)
+        if isinstance(cls, str):
+            return [cls]
+        return [name for name, kind in classes.items()
+                if issubclass(kind, cls)] or [cls.__name__]
@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+"""Connection pool options of DBStorage, read from the environment
+
+They are plain create_engine() arguments, kept apart from db_storage so
+that they can be checked without a MySQL server or mapped models.
+"""
+from os import getenv
+
+
+def pool_options():
+    """Returns the create_engine() keyword arguments set by
+    HBNB_MYSQL_POOL_SIZE, HBNB_MYSQL_MAX_OVERFLOW, HBNB_MYSQL_POOL_RECYCLE
+    (seconds) and HBNB_MYSQL_POOL_PRE_PING (1 or 0); unset variables keep
+    the SQLAlchemy defaults"""
+    pool = {}
+    for option, var in (('pool_size', 'HBNB_MYSQL_POOL_SIZE'),
+                        ('max_overflow', 'HBNB_MYSQL_MAX_OVERFLOW'),
+                        ('pool_recycle', 'HBNB_MYSQL_POOL_RECYCLE')):
+        if getenv(var):
+            pool[option] = int(getenv(var))
+    if getenv('HBNB_MYSQL_POOL_PRE_PING'):
+        pool['pool_pre_ping'] = getenv('HBNB_MYSQL_POOL_PRE_PING') == '1'
+    return pool
@@ -10,33 +10,38 @@ from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from models.engine.db_pool import pool_options
 
 classes = {"User": User, "Place": Place, "State": State,
            "City": City, "Amenity": Amenity, "Review": Review}
 
 
 class DBStorage:
-    """This class manages storage of hbnb models in a SQL database"""
+    """This class manages storage of hbnb models in a SQL database
+
+    It cannot be imported: models.base_model has no declarative Base,
+    and the models keep their attributes in __slots__, which SQLAlchemy
+    cannot instrument. Until they are mapped, it only gets what needs no
+    mapping, and the query APIs of the other engines are not ported to
+    it.
+    """
     __engine = None
     __session = None
 
     def __init__(self):
-        """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        """Instantiate a DBStorage object, its connection pool tuned by
+        the HBNB_MYSQL_POOL_* variables read by pool_options()"""
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.format(
+            getenv('HBNB_MYSQL_USER'), getenv('HBNB_MYSQL_PWD'),
+            getenv('HBNB_MYSQL_HOST'), getenv('HBNB_MYSQL_DB')),
+            **pool_options())
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """Query on the current database session"""
+    def all(self, cls=None, load=None):
+        """Query on the current database session; load is accepted for
+        compatibility with the other engines and ignored"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
@@ -4,7 +4,17 @@
 This module contains the FileStorage class that manages the storage
 and retrieval of objects in a file-based storage system.
 """
+import atexit
+import bisect
+import heapq
 import json
+import os
+import threading
+from os import getenv
+from datetime import datetime
+from functools import partial
+from itertools import chain, islice
+from types import MappingProxyType
 
 from models.base_model import BaseModel
 from models.user import User
@@ -13,45 +23,553 @@ from models.city import City
 from models.place import Place
 from models.amenity import Amenity
 from models.review import Review
+from models.engine import binary_format, json_stream
+from models.engine.geo_index import GeoIndex
+from models.engine.place_index import PlaceIndex
+from models.engine.range_index import RangeIndex
+from models.engine.text_index import TextIndex, text_fields
+
+classes = {"BaseModel": BaseModel, "User": User, "Place": Place,
+           "State": State, "City": City, "Amenity": Amenity,
+           "Review": Review}
+fk_fields = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+             "Review": ("place_id", "user_id")}
+range_fields = {"Place": ("price_by_night", "max_guest", "number_rooms",
+                          "number_bathrooms")}
+relationships = {"State": {"cities": ("City", "state_id")},
+                 "City": {"places": ("Place", "city_id")},
+                 "Place": {"reviews": ("Review", "place_id")},
+                 "User": {"places": ("Place", "user_id"),
+                          "reviews": ("Review", "user_id")}}
 
 
 class FileStorage:
-    """This class manages storage of hbnb models in JSON format"""
+    """This class manages storage of hbnb models in JSON format
+
+    version goes up every time the stored data may have changed: on new,
+    delete, save, foreign key updates and reloads that read something.
+    """
     __file_path = 'file.json'
+    __binary_path = 'file.hbnb'
+    __log_path = 'file.json.log'
+    __text_path = 'file.json.text'
     __objects = {}
+    __partitions = {}
+    __partitioned = None
+    __raw = {}
+    __fk = {(name, field): {} for name, fields in fk_fields.items()
+            for field in fields}
+    __dirty = {}
+    __stale = {}
+    __sorted = {}
+    __places = None
+    __geo = None
+    __text = None
+    __ranges = None
+    __log_entries = 0
+    __snapshot_mark = None
+    __text_mark = None
+    __log_mark = None
+    __log_offset = 0
+    reload_stats = {'skipped': 0, 'incremental': 0, 'full': 0}
+    version = 0
+    __lock = threading.RLock()
+
+    def __init__(self):
+        """Instantiate a FileStorage object
+
+        HBNB_FILE_JOURNAL=1 makes save() append only the changed objects
+        to a log next to the snapshot; the log is compacted back into
+        the snapshot once it holds HBNB_FILE_JOURNAL_RATIO times as many
+        entries as there are objects.
+
+        HBNB_FILE_WRITE_BEHIND=1 makes save() only mark the storage dirty;
+        a background thread flushes it HBNB_FILE_FLUSH_MS milliseconds
+        after the first change, or as soon as HBNB_FILE_FLUSH_CHANGES
+        saves have piled up.
+
+        HBNB_FILE_LAZY=1 makes reload() keep the raw records and build
+        the objects of a class the first time that class is asked for.
+
+        HBNB_FILE_STREAM=1 reads and writes the snapshot one record at a
+        time instead of holding the whole document in memory.
 
-    def all(self, cls=None):
-        """Returns a dictionary of models currently in storage"""
+        HBNB_FILE_FORMAT=binary keeps the snapshot in file.hbnb using the
+        column-per-class layout of binary_format instead of file.json.
+        """
+        self.journal = getenv('HBNB_FILE_JOURNAL', '0') == '1'
+        self.journal_ratio = float(getenv('HBNB_FILE_JOURNAL_RATIO', '1'))
+        self.lazy = getenv('HBNB_FILE_LAZY', '0') == '1'
+        self.stream = getenv('HBNB_FILE_STREAM', '0') == '1'
+        self.format = getenv('HBNB_FILE_FORMAT', 'json')
+        self.write_behind = getenv('HBNB_FILE_WRITE_BEHIND', '0') == '1'
+        self.flush_ms = int(getenv('HBNB_FILE_FLUSH_MS', '100'))
+        self.flush_changes = int(getenv('HBNB_FILE_FLUSH_CHANGES', '100'))
+        self.__pending = 0
+        self.__flusher = None
+        self.__wake = threading.Condition(FileStorage.__lock)
+
+    def all(self, cls=None, load=None):
+        """Returns a dictionary of models currently in storage
+
+        With a class, only the partitions of that class and its
+        subclasses are visited and a read-only view is returned.
+        Relationships are always served by the foreign key indexes, so
+        load is accepted for compatibility with DBStorage and ignored.
+        """
         if cls is None:
+            self.__materialize(FileStorage.__raw)
             return FileStorage.__objects
-        else:
-            return {k: v for k, v in FileStorage.__objects.items()
-                    if isinstance(v, cls)}
+        self.__materialize([name for name in FileStorage.__raw
+                            if issubclass(classes[name], cls)])
+        parts = [part for kind, part in self.__registry().items()
+                 if issubclass(kind, cls)]
+        if len(parts) == 1:
+            return MappingProxyType(parts[0])
+        merged = {}
+        for part in parts:
+            merged.update(part)
+        return MappingProxyType(merged)
+
+    def by_fk(self, cls, field, value):
+        """Returns a read-only view of the objects of cls whose foreign
+        key field equals value"""
+        self.__materialize([cls.__name__])
+        self.__registry()
+        index = FileStorage.__fk.get((cls.__name__, field))
+        if index is None:
+            raise KeyError("{}.{} is not indexed".format(cls.__name__, field))
+        return MappingProxyType(index.get(value, {}))
+
+    def get(self, cls, id):
+        """Returns the object of cls with this id, or None"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+            if cls is None:
+                return None
+        key = cls.__name__ + '.' + id
+        obj = FileStorage.__objects.get(key)
+        if obj is None:
+            record = FileStorage.__raw.get(cls.__name__, {}).get(key)
+            if record is None:
+                return None
+            with FileStorage.__lock:
+                self.__registry()
+                obj = cls(**record)
+                self.__add(key, obj)
+                self.__unload(key)
+        return obj if isinstance(obj, cls) else None
+
+    def get_many(self, cls, ids):
+        """Returns a dictionary of the objects of cls with these ids"""
+        objs = {}
+        for id in ids:
+            obj = self.get(cls, id)
+            if obj is not None:
+                objs[type(obj).__name__ + '.' + obj.id] = obj
+        return objs
+
+    def count(self, cls=None):
+        """Returns the number of objects of cls, or of all objects,
+        without building any of them"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+            if cls is None:
+                return 0
+        parts = self.__registry()
+        total = 0
+        for kind, part in parts.items():
+            if cls is None or issubclass(kind, cls):
+                total += len(part)
+        for name, records in FileStorage.__raw.items():
+            if cls is None or issubclass(classes[name], cls):
+                total += len(records)
+        return total
+
+    def page(self, cls, limit, after=None):
+        """Returns at most limit objects of cls, subclasses excluded, in
+        id order and starting after the id after
+
+        The sorted keys of a class are kept until the next change to the
+        storage, so paging through unchanged data costs a bisect and the
+        objects of the page; in lazy mode only those objects are built.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+            if cls is None:
+                return []
+        name = cls.__name__
+        with FileStorage.__lock:
+            parts = self.__registry()
+            entry = FileStorage.__sorted.get(name)
+            if entry is None or entry[0] != FileStorage.version:
+                entry = (FileStorage.version, sorted(chain(
+                    parts.get(cls, ()), FileStorage.__raw.get(name, ()))))
+                FileStorage.__sorted[name] = entry
+        keys = entry[1]
+        start = 0 if after is None else bisect.bisect_right(
+            keys, name + '.' + after)
+        objs = (self.get(cls, key[len(name) + 1:])
+                for key in keys[start:start + limit])
+        return [obj for obj in objs if obj is not None]
+
+    def search_places(self, states=(), cities=(), amenities=()):
+        """Returns the Places that have all of amenities, sorted by id
+
+        Only the Places of the given cities and of the cities of the
+        given states are searched, or all Places when there are none.
+        Amenities are matched on the bitsets of a PlaceIndex, built on
+        first use and then kept up to date by every write, and cities
+        through the city_id index.
+        """
+        self.__materialize(['Place'])
+        with FileStorage.__lock:
+            self.__registry()
+            self.__refresh()
+            if FileStorage.__places is None:
+                FileStorage.__places = PlaceIndex(
+                    FileStorage.__partitions.get(Place, {}).items())
+            index = FileStorage.__places
+            bits = None
+            if states or cities:
+                city_ids = set(cities)
+                for state_id in states:
+                    city_ids.update(city.id for city in self.by_fk(
+                        City, 'state_id', state_id).values())
+                by_city = FileStorage.__fk[('Place', 'city_id')]
+                bits = index.bits(chain.from_iterable(
+                    by_city.get(city_id, ()) for city_id in city_ids))
+            objects = FileStorage.__objects
+            return [objects[key]
+                    for key in sorted(index.search(bits, amenities))]
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """Returns the (distance in km, Place) pairs of the Places within
+        radius_km of (lat, lon), nearest first
+
+        Places are looked up in a GeoIndex grid, built on first use and
+        then kept up to date by every write.
+        """
+        self.__materialize(['Place'])
+        with FileStorage.__lock:
+            self.__registry()
+            self.__refresh()
+            if FileStorage.__geo is None:
+                FileStorage.__geo = GeoIndex(
+                    FileStorage.__partitions.get(Place, {}).items())
+            objects = FileStorage.__objects
+            return [(distance, objects[key]) for distance, key in
+                    FileStorage.__geo.nearby(lat, lon, radius_km, limit)]
+
+    def range_places(self, ranges=None, cities=(), order_by=None,
+                     limit=None):
+        """Returns the Places in ranges and cities, in order
+
+        Args:
+            ranges (dict): inclusive (low, high) bounds of attributes of
+                range_fields, None meaning unbounded
+            cities (list): city ids the Places must be in, if any
+            order_by (str): an attribute of range_fields to sort on,
+                descending when prefixed with '-'
+            limit (int): the maximum number of Places to return
+
+        Each attribute of range_fields has a RangeIndex, built on first
+        use and then kept up to date by every write. A top-k query walks
+        the index of order_by while that is expected to be shorter than
+        the most selective predicate; otherwise the keys of that
+        predicate are filtered and the best limit of them kept. Places
+        whose attribute is not a number never match a range or order on
+        it.
+        """
+        ranges = dict(ranges or {})
+        field = order_by.lstrip('-') if order_by else None
+        for name in list(ranges) + [field] * bool(field):
+            if name not in range_fields['Place']:
+                raise KeyError("Place.{} is not range indexed".format(name))
+        self.__materialize(['Place'])
+        with FileStorage.__lock:
+            self.__registry()
+            self.__refresh()
+            part = FileStorage.__partitions.get(Place, {})
+            if FileStorage.__ranges is None:
+                FileStorage.__ranges = {
+                    name: RangeIndex((key, getattr(obj, name))
+                                     for key, obj in part.items())
+                    for name in range_fields['Place']}
+            indexes = FileStorage.__ranges
+            by_city = FileStorage.__fk[('Place', 'city_id')]
+            cities = set(cities)
+            sources = [(indexes[name].count(*bounds), name)
+                       for name, bounds in ranges.items()]
+            if cities:
+                sources.append((sum(len(by_city.get(city_id, ()))
+                                    for city_id in cities), ''))
+
+            def match(key):
+                """Tells whether key passes every predicate"""
+                for name, (low, high) in ranges.items():
+                    value = indexes[name].value(key)
+                    if (value is None or low is not None and value < low or
+                            high is not None and value > high):
+                        return False
+                return not cities or part[key].city_id in cities
+
+            fraction = 1.0
+            for count, name in sources:
+                if name != field:
+                    fraction *= count / max(len(part), 1)
+            smallest = min(sources, default=None)
+            if field and (smallest is None or limit is not None and
+                          fraction and limit / fraction < smallest[0]):
+                keys = filter(match, indexes[field].keys(
+                    *ranges.get(field, (None, None)),
+                    reverse=order_by.startswith('-')))
+                keys = list(islice(keys, limit))
+            else:
+                if smallest is None:
+                    keys = part
+                elif not smallest[1]:
+                    keys = chain.from_iterable(by_city.get(city_id, ())
+                                               for city_id in cities)
+                else:
+                    keys = indexes[smallest[1]].keys(*ranges[smallest[1]])
+                keys = [key for key in keys if match(key)]
+                if field:
+                    index = indexes[field]
+                    keys = [key for key in keys
+                            if index.value(key) is not None]
+                    pick = heapq.nlargest if order_by.startswith(
+                        '-') else heapq.nsmallest
+                    keys = pick(len(keys) if limit is None else limit, keys,
+                                key=lambda key: (index.value(key), key))
+                else:
+                    keys = keys[:limit]
+            return [part[key] for key in keys]
+
+    def search_text(self, query, names=None, limit=20):
+        """Returns the (score, object) pairs of the objects best matching
+        the words of query, best first
+
+        Review.text, Place.name and description, City.name and
+        State.name are searched, or only those of the classes in names.
+        The TextIndex is kept up to date by every write. close() and log
+        compactions save it next to the snapshot when the saved copy is
+        out of date, so that reload() can load it instead of rebuilding
+        it; other saves do not rewrite it.
+        """
+        with FileStorage.__lock:
+            self.__registry()
+            self.__refresh()
+            if FileStorage.__text is None:
+                FileStorage.__text = TextIndex()
+                for name in text_fields:
+                    for key, record in FileStorage.__raw.get(
+                            name, {}).items():
+                        self.__index_text(key, record)
+                    for key, obj in FileStorage.__partitions.get(
+                            classes[name], {}).items():
+                        self.__index_text(key, obj)
+            found = FileStorage.__text.search(query, names, limit)
+        results = []
+        for score, key in found:
+            name, _, id = key.partition('.')
+            obj = self.get(name, id)
+            if obj is not None:
+                results.append((score, obj))
+        return results
+
+    def query(self, cls, filters=None, order_by=None, limit=None,
+              offset=0, batch_size=None, load=None):
+        """Yields the objects of cls matching filters, in order
+
+        Args:
+            cls (type): the class to query, subclasses included
+            filters (dict): attribute values the objects must be equal to
+            order_by (str or list): attributes to sort on, each one
+                descending when prefixed with '-'
+            limit (int): the maximum number of objects to yield
+            offset (int): the number of matching objects to skip
+            batch_size (int): unused, objects are already in memory
+            load (list): unused, see all()
+        """
+        filters = dict(filters or {})
+        objs = None
+        for field in fk_fields.get(cls.__name__, ()):
+            if field in filters:
+                objs = self.by_fk(cls, field, filters.pop(field)).values()
+                break
+        if objs is None:
+            objs = self.all(cls).values()
+        if filters:
+            objs = [obj for obj in objs
+                    if all(getattr(obj, field, None) == value
+                           for field, value in filters.items())]
+        if order_by:
+            if isinstance(order_by, str):
+                order_by = [order_by]
+            if limit is not None and len(order_by) == 1:
+                field = order_by[0].lstrip('-')
+                pick = (heapq.nlargest if order_by[0].startswith('-')
+                        else heapq.nsmallest)
+                objs = pick(offset + limit, objs,
+                            key=lambda obj: getattr(obj, field))
+            else:
+                objs = list(objs)
+                for spec in reversed(order_by):
+                    field = spec.lstrip('-')
+                    objs.sort(key=lambda obj: getattr(obj, field),
+                              reverse=spec.startswith('-'))
+        stop = None if limit is None else offset + limit
+        return islice(objs, offset, stop)
+
+    def reindex(self, obj, field, old):
+        """Moves obj in the index of field after its value changed"""
+        index = FileStorage.__fk.get((type(obj).__name__, field))
+        if index is None:
+            return
+        key = type(obj).__name__ + '.' + obj.id
+        with FileStorage.__lock:
+            if FileStorage.__objects.get(key) is not obj:
+                return
+            bucket = index.get(old)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[old]
+            index.setdefault(getattr(obj, field), {})[key] = obj
+            FileStorage.version += 1
+
+    def touch(self, obj):
+        """Marks obj as changed, if it is stored, so that the next save
+        writes it even in journal mode, and the indexes built on first
+        use refresh it before they are next read or saved
+
+        Takes no lock, as setting a dict item is atomic; saves and index
+        refreshes swap the dict they read for an empty one first.
+        """
+        key = type(obj).__name__ + '.' + obj.id
+        if FileStorage.__objects.get(key) is obj:
+            FileStorage.__dirty[key] = obj
+            FileStorage.__stale[key] = obj
 
     def new(self, obj):
         """Adds new object to storage dictionary"""
-        self.all().update({obj.to_dict()['__class__'] + '.' + obj.id: obj})
+        key = type(obj).__name__ + '.' + obj.id
+        with FileStorage.__lock:
+            self.__registry()
+            self.__add(key, obj)
+            FileStorage.__dirty[key] = obj
+            self.__unload(key)
+            FileStorage.version += 1
+
+    def bulk_new(self, objs):
+        """Adds many objects at once; they are written by the next save"""
+        with FileStorage.__lock:
+            self.__registry()
+            for obj in objs:
+                key = type(obj).__name__ + '.' + obj.id
+                self.__add(key, obj)
+                FileStorage.__dirty[key] = obj
+                self.__unload(key)
+            FileStorage.version += 1
+
+    def bulk_delete(self, objs):
+        """Deletes many objects and saves once"""
+        with FileStorage.__lock:
+            self.__registry()
+            for obj in objs:
+                key = type(obj).__name__ + '.' + obj.id
+                if key in FileStorage.__objects:
+                    self.__discard(key)
+                    FileStorage.__dirty[key] = None
+            FileStorage.version += 1
+        self.save()
 
     def save(self):
-        """Saves storage dictionary to file"""
-        with open(FileStorage.__file_path, 'w') as f:
-            temp = {}
-            temp.update(FileStorage.__objects)
-            for key, val in temp.items():
-                temp[key] = val.to_dict()
-            json.dump(temp, f)
+        """Saves storage dictionary to file
+
+        In write-behind mode the write is left to the background flusher.
+        """
+        FileStorage.version += 1
+        if not self.write_behind:
+            self.__flush()
+            return
+        with self.__wake:
+            self.__pending += 1
+            if self.__flusher is None:
+                self.__flusher = threading.Thread(target=self.__flush_loop,
+                                                  daemon=True)
+                self.__flusher.start()
+                atexit.register(self.flush)
+            self.__wake.notify()
+
+    def flush(self):
+        """Writes pending changes to file and syncs them to disk before
+        returning
+
+        In journal mode only the objects changed since the last save
+        are appended to the log, until the log is due for compaction.
+        """
+        self.__flush(durable=True)
+
+    sync = flush
+
+    def __flush(self, durable=False):
+        """Writes pending changes to file, and fsyncs the file and its
+        directory if durable"""
+        with FileStorage.__lock:
+            self.__registry()
+            self.__refresh()
+            dirty, FileStorage.__dirty = FileStorage.__dirty, {}
+            total = len(FileStorage.__objects) + sum(
+                map(len, FileStorage.__raw.values()))
+            append = self.journal and FileStorage.__log_entries + len(
+                dirty) <= self.journal_ratio * total
+            try:
+                if append:
+                    self.__append_log(list(dirty.items()), durable)
+                else:
+                    self.__write_snapshot(durable)
+            except BaseException:
+                dirty.update(FileStorage.__dirty)
+                FileStorage.__dirty = dirty
+                raise
+            self.__pending = 0
+            if self.journal and not append:
+                self.__persist_text()
 
     def reload(self):
-        """Loads objects from the JSON file into storage"""
-        try:
-            with open(FileStorage.__file_path, 'r') as f:
-                objs = json.load(f)
-                for k, v in objs.items():
-                    cls_name = v['__class__']
-                    cls = eval(cls_name)
-                    FileStorage.__objects[k] = cls(**v)
-        except FileNotFoundError:
-            pass
+        """Loads objects from the JSON file and its log into storage
+
+        Nothing is read when neither file changed since they were last
+        read or written, and only the new tail of the log is replayed
+        when the log is the only thing that grew.
+        """
+        with FileStorage.__lock:
+            self.__registry()
+            snapshot_mark = self.__mark(self.__snapshot_path())
+            log_mark = self.__mark(FileStorage.__log_path)
+            stats = FileStorage.reload_stats
+            if (snapshot_mark == FileStorage.__snapshot_mark and
+                    log_mark == FileStorage.__log_mark):
+                stats['skipped'] += 1
+                return
+            if (snapshot_mark == FileStorage.__snapshot_mark and
+                    log_mark is not None and FileStorage.__log_mark and
+                    log_mark[0] == FileStorage.__log_mark[0] and
+                    log_mark[1] > FileStorage.__log_mark[1]):
+                stats['incremental'] += 1
+                self.__replay_log(FileStorage.__log_offset)
+            else:
+                stats['full'] += 1
+                FileStorage.__text = None
+                self.__load_snapshot()
+                self.__load_text(snapshot_mark)
+                FileStorage.__log_entries = 0
+                self.__replay_log(0)
+            FileStorage.version += 1
+            FileStorage.__snapshot_mark = snapshot_mark
+            FileStorage.__log_mark = log_mark
 
     def delete(self, obj=None):
         """Deletes an object from storage if it exists
@@ -62,9 +580,350 @@ class FileStorage:
         if obj is not None:
             key = f"{type(obj).__name__}.{obj.id}"
             if key in FileStorage.__objects:
-                del FileStorage.__objects[key]
+                with FileStorage.__lock:
+                    self.__registry()
+                    self.__discard(key)
+                    FileStorage.__dirty[key] = None
+                    FileStorage.version += 1
                 self.save()
 
     def close(self):
-        """Call the reload method to ensure objects are reloaded"""
+        """Flush pending writes, then reload objects changed on disk"""
+        if self.__pending:
+            self.__flush()
         self.reload()
+        with FileStorage.__lock:
+            self.__persist_text()
+
+    def warm(self):
+        """Builds every object and every index built on first use now
+
+        Workers forked afterwards share them copy-on-write instead of
+        each building its own copy.
+        """
+        self.all()
+        self.search_places()
+        self.nearby(0.0, 0.0, 0.0)
+        self.range_places(limit=0)
+        self.search_text('', limit=0)
+        for cls in classes.values():
+            self.page(cls, 0)
+
+    def __add(self, key, obj):
+        """Stores obj under key in __objects, its class partition and
+        its foreign key indexes"""
+        if type(obj) is Place:
+            self.__index_place(key, obj)
+        if FileStorage.__text is not None:
+            self.__index_text(key, obj)
+        old = FileStorage.__objects.get(key)
+        if old is obj:
+            return
+        if old is not None:
+            self.__partitions[type(old)].pop(key, None)
+            self.__unindex(key, old)
+            object.__setattr__(old, '_watched', None)
+        FileStorage.__objects[key] = obj
+        self.__partitions.setdefault(type(obj), {})[key] = obj
+        self.__index(key, obj)
+
+    def __discard(self, key):
+        """Removes key from __objects, its class partition and its
+        foreign key indexes"""
+        obj = FileStorage.__objects.pop(key, None)
+        if obj is not None:
+            self.__partitions[type(obj)].pop(key, None)
+            self.__unindex(key, obj)
+            object.__setattr__(obj, '_watched', None)
+            if FileStorage.__places is not None:
+                FileStorage.__places.remove(key)
+            if FileStorage.__geo is not None:
+                FileStorage.__geo.remove(key)
+            if FileStorage.__ranges is not None:
+                for index in FileStorage.__ranges.values():
+                    index.remove(key)
+        if FileStorage.__text is not None:
+            FileStorage.__text.remove(key)
+        self.__unload(key)
+
+    def __refresh(self):
+        """Refreshes the objects touched since the last refresh in the
+        indexes built on first use"""
+        stale, FileStorage.__stale = FileStorage.__stale, {}
+        objects = FileStorage.__objects
+        for key, obj in list(stale.items()):
+            if objects.get(key) is not obj:
+                continue
+            if type(obj) is Place:
+                self.__index_place(key, obj)
+            if FileStorage.__text is not None:
+                self.__index_text(key, obj)
+
+    def __index(self, key, obj):
+        """Adds obj to the foreign key indexes of its class, and has it
+        report its attribute writes to storage"""
+        name = type(obj).__name__
+        fields = fk_fields.get(name, ())
+        for field in fields:
+            FileStorage.__fk[(name, field)].setdefault(
+                getattr(obj, field), {})[key] = obj
+        object.__setattr__(obj, '_watched', fields)
+
+    def __unindex(self, key, obj):
+        """Removes obj from the foreign key indexes of its class"""
+        name = type(obj).__name__
+        for field in fk_fields.get(name, ()):
+            index = FileStorage.__fk[(name, field)]
+            value = getattr(obj, field)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+
+    def __index_place(self, key, place):
+        """Adds or refreshes place in the Place indexes that are built"""
+        if FileStorage.__places is not None:
+            FileStorage.__places.add(key, place)
+        if FileStorage.__geo is not None:
+            FileStorage.__geo.add(key, place)
+        if FileStorage.__ranges is not None:
+            for field, index in FileStorage.__ranges.items():
+                index.add(key, getattr(place, field))
+
+    def __index_text(self, key, obj):
+        """Indexes the text fields of an object or raw record"""
+        fields = text_fields.get(key.partition('.')[0])
+        if fields:
+            get = obj.get if isinstance(obj, dict) else partial(getattr, obj)
+            FileStorage.__text.add(key, [get(field, '') for field in fields])
+
+    def __persist_text(self):
+        """Saves the text index if it is built, everything is in the
+        snapshot, and the saved copy is of another snapshot"""
+        if (FileStorage.__text is not None and not FileStorage.__dirty and
+                not FileStorage.__log_entries and
+                FileStorage.__snapshot_mark is not None and
+                FileStorage.__text_mark != FileStorage.__snapshot_mark):
+            self.__save_text()
+
+    def __save_text(self):
+        """Writes the text index with the mark of the snapshot it
+        matches"""
+        tmp_path = FileStorage.__text_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            FileStorage.__text.dump(f, FileStorage.__snapshot_mark)
+        os.replace(tmp_path, FileStorage.__text_path)
+        FileStorage.__text_mark = FileStorage.__snapshot_mark
+
+    def __load_text(self, mark):
+        """Loads the saved text index if it matches the snapshot mark"""
+        try:
+            with open(FileStorage.__text_path, 'r') as f:
+                saved, index = TextIndex.load(f)
+        except (FileNotFoundError, ValueError, KeyError):
+            return
+        if mark is not None and saved == list(mark):
+            FileStorage.__text = index
+            FileStorage.__text_mark = mark
+
+    def __load(self, key, record):
+        """Builds the object of record, or keeps the record if lazy"""
+        if self.lazy:
+            self.__discard(key)
+            FileStorage.__raw.setdefault(record['__class__'], {})[key] = record
+            if FileStorage.__text is not None:
+                self.__index_text(key, record)
+        else:
+            self.__add(key, classes[record['__class__']](**record))
+
+    def __unload(self, key):
+        """Drops the raw record stored under key, if any"""
+        records = FileStorage.__raw.get(key.partition('.')[0])
+        if records:
+            records.pop(key, None)
+
+    def __materialize(self, names):
+        """Builds the objects of the raw records of the named classes"""
+        names = [name for name in names if name in FileStorage.__raw]
+        if not names:
+            return
+        with FileStorage.__lock:
+            self.__registry()
+            for name in names:
+                cls = classes[name]
+                for key, record in FileStorage.__raw.pop(name, {}).items():
+                    self.__add(key, cls(**record))
+
+    def __load_snapshot(self):
+        """Loads the objects of the snapshot"""
+        try:
+            if self.format == 'binary':
+                with open(FileStorage.__binary_path, 'rb') as f:
+                    for k, v in binary_format.load(f):
+                        self.__load(k, v)
+                return
+            with open(FileStorage.__file_path, 'r') as f:
+                if self.stream:
+                    objs = json_stream.iter_items(f)
+                else:
+                    objs = json.load(f).items()
+                for k, v in objs:
+                    self.__load(k, v)
+        except FileNotFoundError:
+            pass
+
+    def __replay_log(self, offset):
+        """Applies the journal entries found past offset in the log"""
+        try:
+            with open(FileStorage.__log_path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    entry = json.loads(line)
+                    v = entry['value']
+                    if v is None:
+                        self.__discard(entry['key'])
+                    else:
+                        self.__load(entry['key'], v)
+                    FileStorage.__log_entries += 1
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        FileStorage.__log_offset = offset
+
+    def __snapshot_path(self):
+        """Returns the path of the snapshot in the selected format"""
+        if self.format == 'binary':
+            return FileStorage.__binary_path
+        return FileStorage.__file_path
+
+    @staticmethod
+    def __fsync(f):
+        """Flushes the open file f and syncs it to disk"""
+        f.flush()
+        os.fsync(f.fileno())
+
+    @staticmethod
+    def __fsync_dir(path):
+        """Syncs the directory of path, so that files created, renamed or
+        removed in it survive a crash"""
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def __mark(path):
+        """Returns the (inode, size, mtime) of path, or None"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __write_snapshot(self, durable=False):
+        """Rewrites the whole snapshot and empties the log"""
+        path = self.__snapshot_path()
+        tmp_path = path + '.tmp'
+        if self.format == 'binary':
+            records = {}
+            for cls, part in self.__registry().items():
+                if part:
+                    records[cls.__name__] = [obj.to_dict()
+                                             for obj in part.values()]
+            for name, raw in FileStorage.__raw.items():
+                records.setdefault(name, []).extend(raw.values())
+            with open(tmp_path, 'wb') as f:
+                binary_format.dump(records, f)
+                if durable:
+                    self.__fsync(f)
+        else:
+            with open(tmp_path, 'w') as f:
+                self.__dump_json(f)
+                if durable:
+                    self.__fsync(f)
+        os.replace(tmp_path, path)
+        try:
+            os.remove(FileStorage.__log_path)
+        except FileNotFoundError:
+            pass
+        if durable:
+            self.__fsync_dir(path)
+        FileStorage.__log_entries = 0
+        FileStorage.__snapshot_mark = self.__mark(path)
+        FileStorage.__log_mark = None
+        FileStorage.__log_offset = 0
+
+    def __dump_json(self, f):
+        """Writes every object and raw record to f as JSON"""
+        if self.stream:
+            json_stream.dump_items(chain(
+                ((key, val.to_dict())
+                 for key, val in FileStorage.__objects.items()),
+                *(records.items()
+                  for records in FileStorage.__raw.values())), f,
+                default=datetime.isoformat)
+        else:
+            temp = {}
+            temp.update(FileStorage.__objects)
+            for key, val in temp.items():
+                temp[key] = val.to_dict()
+            for records in FileStorage.__raw.values():
+                temp.update(records)
+            json.dump(temp, f, default=datetime.isoformat)
+
+    def __append_log(self, changes, durable=False):
+        """Appends the (key, object or None) pairs of changes to the log"""
+        in_sync = self.__mark(FileStorage.__log_path) == FileStorage.__log_mark
+        with open(FileStorage.__log_path, 'a') as f:
+            for key, obj in changes:
+                value = None if obj is None else obj.to_dict()
+                f.write(json.dumps({'key': key, 'value': value}) + '\n')
+            if durable:
+                self.__fsync(f)
+        if durable:
+            self.__fsync_dir(FileStorage.__log_path)
+        FileStorage.__log_entries += len(changes)
+        if in_sync:
+            FileStorage.__log_mark = self.__mark(FileStorage.__log_path)
+            FileStorage.__log_offset = FileStorage.__log_mark[1]
+
+    def __flush_loop(self):
+        """Background flusher used in write-behind mode"""
+        with self.__wake:
+            while True:
+                self.__wake.wait_for(lambda: self.__pending)
+                self.__wake.wait_for(
+                    lambda: self.__pending >= self.flush_changes,
+                    timeout=self.flush_ms / 1000)
+                if self.__pending:
+                    self.__flush()
+
+    def __registry(self):
+        """Returns the class partitions, rebuilt if __objects was
+        replaced or edited behind the storage's back"""
+        objects = FileStorage.__objects
+        parts = FileStorage.__partitions
+        if (FileStorage.__partitioned is not objects or
+                sum(map(len, parts.values())) != len(objects)):
+            if FileStorage.__partitioned is not objects:
+                FileStorage.__raw.clear()
+            FileStorage.__snapshot_mark = FileStorage.__log_mark = None
+            parts.clear()
+            FileStorage.__places = FileStorage.__geo = None
+            FileStorage.__text = FileStorage.__ranges = None
+            for index in FileStorage.__fk.values():
+                index.clear()
+            for key, obj in objects.items():
+                parts.setdefault(type(obj), {})[key] = obj
+                self.__index(key, obj)
+            dirty = FileStorage.__dirty
+            for key in [k for k, v in dirty.items()
+                        if v is not None and k not in objects]:
+                del dirty[key]
+            FileStorage.__partitioned = objects
+            FileStorage.version += 1
+        return parts
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""Grid index of places on latitude and longitude
+
+The globe is cut into cells of a fixed size in degrees. A search only
+visits the cells that overlap the bounding box of its circle, and only
+measures the haversine distance of the places in them.
+"""
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Returns the great-circle distance between two points, in km"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) *
+         math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """Returns (south, north, west, east) around the circle, in degrees;
+    west is greater than east when the box crosses the antimeridian"""
+    dlat = radius_km / KM_PER_DEGREE
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    if south == -90.0 or north == 90.0:
+        return south, north, -180.0, 180.0
+    ratio = math.sin(math.radians(dlat)) / math.cos(math.radians(lat))
+    if dlat >= 90.0 or ratio >= 1.0:
+        return south, north, -180.0, 180.0
+    dlon = math.degrees(math.asin(ratio))
+    west, east = lon - dlon, lon + dlon
+    if west < -180.0:
+        west += 360.0
+    if east > 180.0:
+        east -= 360.0
+    return south, north, west, east
+
+
+class GeoIndex:
+    """Places bucketed in cells of cell_size degrees"""
+
+    def __init__(self, places=(), cell_size=0.1):
+        """Builds the index of places, an iterable of (key, Place)"""
+        self.cell_size = cell_size
+        self.__cells = {}
+        self.__where = {}
+        for key, place in places:
+            self.add(key, place)
+
+    def __len__(self):
+        """Returns the number of indexed places"""
+        return len(self.__where)
+
+    def add(self, key, place):
+        """Indexes place under key, or moves it if it changed; places
+        without a valid position are left out"""
+        try:
+            point = (float(place.latitude), float(place.longitude))
+        except (TypeError, ValueError):
+            self.remove(key)
+            return
+        old = self.__where.get(key)
+        if old is not None:
+            if old == point:
+                return
+            self.remove(key)
+        self.__where[key] = point
+        self.__cells.setdefault(self.__cell(*point), {})[key] = point
+
+    def remove(self, key):
+        """Drops the place indexed under key, if any"""
+        point = self.__where.pop(key, None)
+        if point is not None:
+            cell = self.__cell(*point)
+            bucket = self.__cells[cell]
+            del bucket[key]
+            if not bucket:
+                del self.__cells[cell]
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """Returns the (distance, key) of the places within radius_km of
+        (lat, lon), nearest first"""
+        south, north, west, east = bounding_box(lat, lon, radius_km)
+        rows = range(self.__row(south), self.__row(north) + 1)
+        if west <= east:
+            cols = list(range(self.__col(west), self.__col(east) + 1))
+        else:
+            cols = (list(range(self.__col(west), self.__col(180.0) + 1)) +
+                    list(range(self.__col(-180.0), self.__col(east) + 1)))
+        if len(rows) * len(cols) > len(self.__cells):
+            rows, cols = set(rows), set(cols)
+            cells = [bucket for (row, col), bucket in self.__cells.items()
+                     if row in rows and col in cols]
+        else:
+            cells = [self.__cells[(row, col)] for row in rows
+                     for col in cols if (row, col) in self.__cells]
+        found = []
+        for bucket in cells:
+            for key, (plat, plon) in bucket.items():
+                distance = haversine(lat, lon, plat, plon)
+                if distance <= radius_km:
+                    found.append((distance, key))
+        if limit is not None:
+            return heapq.nsmallest(limit, found)
+        found.sort()
+        return found
+
+    def __cell(self, lat, lon):
+        """Returns the cell of a point"""
+        return self.__row(lat), self.__col(lon)
+
+    def __row(self, lat):
+        """Returns the row of a latitude"""
+        return math.floor(lat / self.cell_size)
+
+    def __col(self, lon):
+        """Returns the column of a longitude"""
+        return math.floor(lon / self.cell_size)
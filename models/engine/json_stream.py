@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Streaming reader and writer for the top-level JSON object of file.json
+
+Only one (key, value) pair is held in memory at a time, on top of a
+read buffer of a fixed size.
+"""
+import json
+import re
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_decode = json.JSONDecoder().raw_decode
+
+
+def iter_items(f, size=1 << 16):
+    """Yields the (key, value) pairs of the JSON object read from f"""
+    buf, pos, eof = '', 0, False
+    state = 'open'
+    while True:
+        pos = _whitespace.match(buf, pos).end()
+        refill = pos == len(buf)
+        if not refill and (state in ('key', 'value') or
+                           state == 'first' and buf[pos] != '}'):
+            try:
+                item, end = _decode(buf, pos)
+                refill = end == len(buf) and not eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill = True
+        if refill:
+            if eof:
+                raise json.JSONDecodeError('Expecting value', buf, pos)
+            chunk = f.read(size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        char = buf[pos]
+        if state == 'open':
+            if char != '{':
+                raise json.JSONDecodeError("Expecting '{'", buf, pos)
+            pos, state = pos + 1, 'first'
+        elif state == 'first' and char == '}':
+            return
+        elif state in ('first', 'key'):
+            key, pos, state = item, end, 'colon'
+        elif state == 'value':
+            yield key, item
+            pos, state = end, 'next'
+        elif state == 'colon':
+            if char != ':':
+                raise json.JSONDecodeError("Expecting ':'", buf, pos)
+            pos, state = pos + 1, 'value'
+        elif char == ',':
+            pos, state = pos + 1, 'key'
+        elif char == '}':
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' or '}'", buf, pos)
+
+
+def dump_items(items, f, default=None):
+    """Writes the (key, value) pairs of items to f as one JSON object"""
+    f.write('{')
+    sep = ''
+    for key, value in items:
+        f.write(sep + json.dumps(key) + ': ' +
+                json.dumps(value, default=default))
+        sep = ', '
+    f.write('}')
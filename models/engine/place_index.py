@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""Inverted index from amenity ids to places, as integer bitsets
+
+Every indexed place owns a bit position, and each amenity owns a Python
+int with the bits of the places that have it set. "Places with all of
+these amenities" is then an AND of a few ints, done in C, and the
+places of a set of cities are turned into a bitset of the same
+positions to be ANDed with it.
+"""
+import re
+
+_nonzero = re.compile(b'[^\x00]')
+
+
+def bitset(positions, size):
+    """Returns the int with the bits at positions set"""
+    buf = bytearray((size + 7) >> 3)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def positions(bits):
+    """Yields the positions of the bits set in bits, in order"""
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, 'little')
+    for match in _nonzero.finditer(data):
+        base, byte = match.start() << 3, data[match.start()]
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield base + bit
+
+
+class PlaceIndex:
+    """Bit positions of places and bitsets of amenities"""
+
+    def __init__(self, places=()):
+        """Builds the index of places, an iterable of (key, Place)"""
+        self.__slot = {}
+        self.__keys = []
+        self.__free = []
+        members = {}
+        for key, place in places:
+            pos = self.__claim(key)
+            for amenity_id in place.amenity_ids:
+                members.setdefault(amenity_id, []).append(pos)
+        size = len(self.__keys)
+        self.__amenities = {amenity_id: bitset(found, size)
+                            for amenity_id, found in members.items()}
+        self.__all = bitset(self.__slot.values(), size)
+
+    def __len__(self):
+        """Returns the number of indexed places"""
+        return len(self.__slot)
+
+    def add(self, key, place):
+        """Indexes place under key, or refreshes it if already there"""
+        pos = self.__slot.get(key)
+        if pos is None:
+            pos = self.__claim(key)
+        else:
+            self.__clear(pos)
+        bit = 1 << pos
+        for amenity_id in place.amenity_ids:
+            self.__amenities[amenity_id] = (
+                self.__amenities.get(amenity_id, 0) | bit)
+        self.__all |= bit
+
+    def remove(self, key):
+        """Drops the place indexed under key, if any"""
+        pos = self.__slot.pop(key, None)
+        if pos is not None:
+            self.__clear(pos)
+            self.__all &= ~(1 << pos)
+            self.__keys[pos] = None
+            self.__free.append(pos)
+
+    def bits(self, keys):
+        """Returns the bitset of the indexed places among keys"""
+        slot = self.__slot
+        return bitset((slot[key] for key in keys if key in slot),
+                      len(self.__keys))
+
+    def search(self, bits=None, amenity_ids=()):
+        """Returns the keys of the places in bits, or of all places,
+        that have all of amenity_ids"""
+        result = self.__all if bits is None else bits
+        for amenity_id in amenity_ids:
+            result &= self.__amenities.get(amenity_id, 0)
+            if not result:
+                return []
+        keys = self.__keys
+        return [keys[pos] for pos in positions(result)]
+
+    def __claim(self, key):
+        """Gives key a free bit position"""
+        if self.__free:
+            pos = self.__free.pop()
+            self.__keys[pos] = key
+        else:
+            pos = len(self.__keys)
+            self.__keys.append(key)
+        self.__slot[key] = pos
+        return pos
+
+    def __clear(self, pos):
+        """Clears the bit pos in every amenity bitset"""
+        mask = ~(1 << pos)
+        for amenity_id, bits in list(self.__amenities.items()):
+            if bits >> pos & 1:
+                bits &= mask
+                if bits:
+                    self.__amenities[amenity_id] = bits
+                else:
+                    del self.__amenities[amenity_id]
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Sorted secondary index of a numeric attribute
+
+Entries are kept sorted by (value, key) in an array of values and a
+parallel list of keys, so a range of values is found with two bisects
+and walked in order, in either direction.
+"""
+import bisect
+from array import array
+
+
+class RangeIndex:
+    """Keys sorted by the value of one numeric attribute"""
+
+    def __init__(self, entries=()):
+        """Builds the index of entries, an iterable of (key, value);
+        values that are not numbers are left out"""
+        pairs = []
+        for key, value in entries:
+            value = self.__number(value)
+            if value is not None:
+                pairs.append((value, key))
+        pairs.sort()
+        self.__values = array('d', [value for value, key in pairs])
+        self.__keys = [key for value, key in pairs]
+        self.__of = {key: value for value, key in pairs}
+
+    def __len__(self):
+        """Returns the number of indexed keys"""
+        return len(self.__keys)
+
+    def add(self, key, value):
+        """Indexes key under value, moving it if it had another one"""
+        value = self.__number(value)
+        old = self.__of.get(key)
+        if old is not None:
+            if old == value:
+                return
+            self.remove(key)
+        if value is None:
+            return
+        pos = self.__find(value, key)
+        self.__values.insert(pos, value)
+        self.__keys.insert(pos, key)
+        self.__of[key] = value
+
+    def remove(self, key):
+        """Drops key, if indexed"""
+        value = self.__of.pop(key, None)
+        if value is not None:
+            pos = self.__find(value, key)
+            del self.__values[pos]
+            del self.__keys[pos]
+
+    def value(self, key):
+        """Returns the indexed value of key, or None"""
+        return self.__of.get(key)
+
+    def bounds(self, low=None, high=None):
+        """Returns the slice of positions with low <= value <= high"""
+        start = 0 if low is None else bisect.bisect_left(self.__values, low)
+        stop = (len(self.__values) if high is None
+                else bisect.bisect_right(self.__values, high))
+        return start, max(start, stop)
+
+    def count(self, low=None, high=None):
+        """Returns the number of keys with low <= value <= high"""
+        start, stop = self.bounds(low, high)
+        return stop - start
+
+    def keys(self, low=None, high=None, reverse=False):
+        """Yields the keys with low <= value <= high, by value"""
+        start, stop = self.bounds(low, high)
+        keys = self.__keys
+        positions = range(stop - 1, start - 1, -1) if reverse else range(
+            start, stop)
+        for pos in positions:
+            yield keys[pos]
+
+    def __find(self, value, key):
+        """Returns the position of (value, key) in the sorted entries"""
+        lo = bisect.bisect_left(self.__values, value)
+        hi = bisect.bisect_right(self.__values, value, lo)
+        return bisect.bisect_left(self.__keys, key, lo, hi)
+
+    @staticmethod
+    def __number(value):
+        """Returns value as a float, or None if it is not a number or
+        is NaN"""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        value = float(value)
+        return None if value != value else value
@@ -0,0 +1,434 @@
+#!/usr/bin/python3
+"""This module defines a class to manage SQLite storage for hbnb clone"""
+import json
+import os
+import sqlite3
+import threading
+from os import getenv
+from models.engine.file_storage import (classes, fk_fields, range_fields,
+                                        relationships)
+from models.engine.geo_index import bounding_box, haversine
+
+fk_columns = ('state_id', 'city_id', 'place_id', 'user_id')
+
+
+class SQLiteStorage:
+    """This class manages storage of hbnb models in a local SQLite file
+
+    Every object is one row of the objects table, keyed by class name and
+    id, with its foreign keys in indexed columns and its to_dict() as
+    JSON. Like DBStorage, each thread works in its own session: new and
+    delete are staged, written before the next read, and only committed
+    by save(); close() drops whatever was not saved.
+    """
+    __path = None
+    __local = None
+    query_count = 0
+
+    def __init__(self):
+        """Instantiate a SQLiteStorage object"""
+        self.__path = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        self.__local = threading.local()
+        self.__changes = 0
+        self.__marks = None
+
+    @property
+    def version(self):
+        """Goes up every time the data may have changed, by a change
+        staged in this process or by a commit to the file from anywhere"""
+        marks = (self.__stat(self.__path), self.__stat(self.__path + '-wal'))
+        if marks != self.__marks:
+            self.__marks = marks
+            self.__changes += 1
+        return self.__changes
+
+    def all(self, cls=None, load=None):
+        """Query all objects, or the objects of cls and its subclasses
+
+        Relationships named in load are fetched for all the objects with
+        one query each, instead of one query per object later on.
+        """
+        names = self.__names(cls)
+        if not names:
+            return {}
+        rows = self.__query('SELECT cls, id, data FROM objects '
+                            'WHERE cls IN ({})'.format(
+                                ','.join('?' * len(names))), names)
+        objs = self.__build(rows)
+        self.__prefetch(objs.values(), load)
+        return objs
+
+    def by_fk(self, cls, field, value):
+        """Query the objects of cls whose foreign key field equals value"""
+        if field not in fk_fields.get(cls.__name__, ()):
+            raise KeyError("{}.{} is not indexed".format(cls.__name__, field))
+        session = self.__session()
+        if not session['pending']:
+            bucket = session['prefetched'].get(
+                (cls.__name__, field), {}).get(value)
+            if bucket is not None:
+                return dict(bucket)
+        rows = self.__query('SELECT cls, id, data FROM objects '
+                            'WHERE cls = ? AND {} = ?'.format(field),
+                            (cls.__name__, value))
+        return self.__build(rows)
+
+    def get(self, cls, id):
+        """Returns the object of cls with this id, or None"""
+        objs = self.get_many(cls, [id])
+        return next(iter(objs.values()), None)
+
+    def get_many(self, cls, ids):
+        """Returns a dictionary of the objects of cls with these ids,
+        looked up by primary key"""
+        names = self.__names(cls)
+        objects = self.__session()['objects']
+        result, missing = {}, []
+        for id in ids:
+            for name in names:
+                obj = objects.get(name + '.' + id)
+                if obj is not None:
+                    result[name + '.' + id] = obj
+                    break
+            else:
+                missing.append(id)
+        for start in range(0, len(missing), 500):
+            batch = missing[start:start + 500]
+            result.update(self.__build(self.__query(
+                'SELECT cls, id, data FROM objects WHERE cls IN ({}) '
+                'AND id IN ({})'.format(','.join('?' * len(names)),
+                                        ','.join('?' * len(batch))),
+                names + batch)))
+        return result
+
+    def count(self, cls=None):
+        """Returns the number of objects of cls, or of all objects, with
+        SELECT COUNT(*)"""
+        names = self.__names(cls)
+        if not names:
+            return 0
+        return self.__query('SELECT COUNT(*) FROM objects WHERE cls IN ({})'
+                            .format(','.join('?' * len(names))),
+                            names).fetchone()[0]
+
+    def page(self, cls, limit, after=None):
+        """Returns at most limit objects of cls, subclasses excluded, in
+        id order and starting after the id after, walking the primary
+        key"""
+        name = cls if isinstance(cls, str) else cls.__name__
+        rows = self.__query('SELECT cls, id, data FROM objects '
+                            'WHERE cls = ? AND id > ? ORDER BY id LIMIT ?',
+                            (name, after or '', limit))
+        return list(self.__build(rows).values())
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """Returns the (distance in km, Place) pairs of the Places within
+        radius_km of (lat, lon), nearest first
+
+        The bounding box of the circle is looked up on an index of the
+        latitudes, and only the Places in it are measured.
+        """
+        south, north, west, east = bounding_box(lat, lon, radius_km)
+        latitude = self.__column('latitude')
+        longitude = self.__column('longitude')
+        sql = ("SELECT cls, id, data FROM objects WHERE cls = 'Place' "
+               "AND {} BETWEEN ? AND ? AND ".format(latitude))
+        if west <= east:
+            sql += '{} BETWEEN ? AND ?'.format(longitude)
+        else:
+            sql += '({0} >= ? OR {0} <= ?)'.format(longitude)
+        found = []
+        for place in self.__build(self.__query(
+                sql, (south, north, west, east))).values():
+            distance = haversine(lat, lon, place.latitude, place.longitude)
+            if distance <= radius_km:
+                found.append((distance, place))
+        found.sort(key=lambda pair: pair[0])
+        return found[:limit]
+
+    def range_places(self, ranges=None, cities=(), order_by=None,
+                     limit=None):
+        """Returns the Places in ranges and cities, in order
+
+        ranges maps attributes of range_fields to inclusive (low, high)
+        bounds, None being unbounded, and order_by is one of them,
+        descending when prefixed with '-'. Each of them has an index.
+        As in FileStorage, an attribute never set counts as its class
+        default, and Places whose attribute is not a number never match
+        a range or order on it.
+        """
+        sql = "SELECT cls, id, data FROM objects WHERE cls = 'Place'"
+        params = []
+        field = order_by.lstrip('-') if order_by else None
+        for name in list(ranges or ()) + [field] * bool(field):
+            if name not in range_fields['Place']:
+                raise KeyError("Place.{} is not range indexed".format(name))
+        for name, (low, high) in (ranges or {}).items():
+            value, number = self.__number(name)
+            sql += ' AND ' + number
+            for op, bound in (('>=', low), ('<=', high)):
+                if bound is not None:
+                    sql += ' AND {} {} ?'.format(value, op)
+                    params.append(bound)
+        if cities:
+            sql += ' AND city_id IN ({})'.format(','.join('?' * len(cities)))
+            params += list(cities)
+        if field:
+            value, number = self.__number(field)
+            sql += ' AND {0} ORDER BY {1} {2}, id {2}'.format(
+                number, value, 'DESC' if order_by.startswith('-') else 'ASC')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return list(self.__build(self.__query(sql, params)).values())
+
+    def search_places(self, states=(), cities=(), amenities=()):
+        """Returns the Places that have all of amenities, in the given
+        cities and the cities of the given states if any, sorted by id"""
+        sql = "SELECT cls, id, data FROM objects WHERE cls = 'Place'"
+        params = []
+        if states or cities:
+            sql += (" AND (city_id IN ({}) OR city_id IN (SELECT id FROM "
+                    "objects WHERE cls = 'City' AND state_id IN ({})))"
+                    .format(','.join('?' * len(cities)),
+                            ','.join('?' * len(states))))
+            params += list(cities) + list(states)
+        for amenity_id in amenities:
+            sql += (" AND EXISTS (SELECT 1 FROM json_each(data, "
+                    "'$.amenity_ids') WHERE value = ?)")
+            params.append(amenity_id)
+        return list(self.__build(self.__query(sql + ' ORDER BY id',
+                                              params)).values())
+
+    def query(self, cls, filters=None, order_by=None, limit=None,
+              offset=0, batch_size=1000, load=None):
+        """Yields the objects of cls matching filters, in order
+
+        Filters, ordering, offset and limit are done in SQL, on the
+        indexed columns when possible and on the JSON data otherwise,
+        and rows are fetched batch_size at a time.
+        """
+        names = self.__names(cls)
+        if not names:
+            return iter(())
+        sql = 'SELECT cls, id, data FROM objects WHERE cls IN ({})'.format(
+            ','.join('?' * len(names)))
+        params = list(names)
+        for field, value in (filters or {}).items():
+            sql += ' AND {} = ?'.format(self.__column(field))
+            params.append(value)
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        if order_by:
+            sql += ' ORDER BY ' + ', '.join(
+                self.__column(spec.lstrip('-')) +
+                (' DESC' if spec.startswith('-') else '')
+                for spec in order_by)
+        if limit is not None or offset:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [-1 if limit is None else limit, offset]
+        return self.__stream(self.__query(sql, params), batch_size, load)
+
+    def new(self, obj):
+        """Add the object to the current session"""
+        key = type(obj).__name__ + '.' + obj.id
+        session = self.__session()
+        session['objects'][key] = obj
+        session['pending'][key] = obj
+        session['prefetched'].clear()
+        self.__changes += 1
+
+    def bulk_new(self, objs):
+        """Add many objects to the current session; save() writes them
+        with one executemany upsert"""
+        session = self.__session()
+        for obj in objs:
+            key = type(obj).__name__ + '.' + obj.id
+            session['objects'][key] = obj
+            session['pending'][key] = obj
+        session['prefetched'].clear()
+        self.__changes += 1
+
+    def bulk_delete(self, objs):
+        """Delete many objects from the current session; save() removes
+        them with one executemany DELETE"""
+        for obj in objs:
+            self.delete(obj)
+
+    def save(self):
+        """Commit all changes of the current session"""
+        self.__flush()
+        self.__connection().commit()
+
+    def delete(self, obj=None):
+        """Delete obj from the current session if not None"""
+        if obj is not None:
+            key = type(obj).__name__ + '.' + obj.id
+            session = self.__session()
+            session['objects'].pop(key, None)
+            session['pending'][key] = None
+            session['prefetched'].clear()
+            self.__changes += 1
+
+    def reload(self):
+        """Creates the table and indexes if needed and opens a session"""
+        conn = self.__connection()
+        conn.execute('CREATE TABLE IF NOT EXISTS objects ('
+                     'cls TEXT NOT NULL, id TEXT NOT NULL, {}, '
+                     'data TEXT NOT NULL, PRIMARY KEY (cls, id))'
+                     .format(', '.join(c + ' TEXT' for c in fk_columns)))
+        for column in fk_columns:
+            conn.execute('CREATE INDEX IF NOT EXISTS objects_{0} '
+                         'ON objects (cls, {0})'.format(column))
+        conn.execute('CREATE INDEX IF NOT EXISTS objects_latitude ON '
+                     'objects (cls, {})'.format(self.__column('latitude')))
+        for field in range_fields['Place']:
+            conn.execute('DROP INDEX IF EXISTS objects_{}'.format(field))
+            conn.execute('CREATE INDEX IF NOT EXISTS places_{} ON objects '
+                         '(cls, {})'.format(field, self.__number(field)[0]))
+        conn.commit()
+
+    def close(self):
+        """Discard the current session and its uncommitted changes"""
+        conn = getattr(self.__local, 'conn', None)
+        if conn is not None:
+            conn.rollback()
+            conn.close()
+        self.__local.__dict__.clear()
+
+    def __connection(self):
+        """Returns the connection of the current thread"""
+        conn = getattr(self.__local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.__path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self.__local.conn = conn
+        return conn
+
+    def __session(self):
+        """Returns the identity map and staged changes of the thread"""
+        session = getattr(self.__local, 'session', None)
+        if session is None:
+            session = {'objects': {}, 'pending': {}, 'prefetched': {}}
+            self.__local.session = session
+        return session
+
+    def __flush(self):
+        """Writes the staged changes without committing them"""
+        pending = self.__session()['pending']
+        if not pending:
+            return
+        upserts, deletes = [], []
+        for key, obj in pending.items():
+            name, _, obj_id = key.partition('.')
+            if obj is None:
+                deletes.append((name, obj_id))
+                continue
+            fields = fk_fields.get(name, ())
+            upserts.append((name, obj_id) + tuple(
+                getattr(obj, c) if c in fields else None
+                for c in fk_columns) + (json.dumps(obj.to_dict()),))
+        conn = self.__connection()
+        conn.executemany(
+            'INSERT INTO objects (cls, id, {0}, data) VALUES ({1}) '
+            'ON CONFLICT (cls, id) DO UPDATE SET {2}, data = excluded.data'
+            .format(', '.join(fk_columns),
+                    ', '.join('?' * (len(fk_columns) + 3)),
+                    ', '.join('{0} = excluded.{0}'.format(c)
+                              for c in fk_columns)), upserts)
+        conn.executemany('DELETE FROM objects WHERE cls = ? AND id = ?',
+                         deletes)
+        pending.clear()
+
+    def __query(self, sql, params):
+        """Flushes the staged changes, then runs a query"""
+        self.__flush()
+        self.query_count += 1
+        return self.__connection().execute(sql, params)
+
+    def __prefetch(self, objs, load):
+        """Fetches the relationships in load for all of objs at once"""
+        for name in load or ():
+            parents = {}
+            for obj in objs:
+                relation = relationships.get(type(obj).__name__, {})
+                if name in relation:
+                    parents.setdefault(relation[name], []).append(obj.id)
+            for (child, field), ids in parents.items():
+                buckets = self.__session()['prefetched'].setdefault(
+                    (child, field), {})
+                for id in ids:
+                    buckets[id] = {}
+                for start in range(0, len(ids), 500):
+                    batch = ids[start:start + 500]
+                    rows = self.__query(
+                        'SELECT cls, id, data FROM objects WHERE cls = ? '
+                        'AND {} IN ({})'.format(field,
+                                                ','.join('?' * len(batch))),
+                        [child] + batch)
+                    for key, obj in self.__build(rows).items():
+                        buckets[getattr(obj, field)][key] = obj
+
+    def __build(self, rows):
+        """Maps rows to objects, reusing those already in the session"""
+        objects = self.__session()['objects']
+        result = {}
+        for name, obj_id, data in rows:
+            key = name + '.' + obj_id
+            obj = objects.get(key)
+            if obj is None:
+                obj = classes[name](**json.loads(data))
+                objects[key] = obj
+            result[key] = obj
+        return result
+
+    def __stream(self, cursor, batch_size, load):
+        """Yields the objects of the rows of cursor, batch by batch"""
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            objs = self.__build(rows).values()
+            self.__prefetch(objs, load)
+            yield from objs
+
+    @staticmethod
+    def __stat(path):
+        """Returns the identity, size and mtime of a file, or None"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    def __column(field):
+        """Returns the SQL expression of a model attribute"""
+        if not field.isidentifier():
+            raise ValueError("Invalid attribute name: {}".format(field))
+        if field in ('id',) + fk_columns:
+            return field
+        return "json_extract(data, '$.{}')".format(field)
+
+    @staticmethod
+    def __number(field):
+        """Returns the SQL expressions of a numeric Place attribute, the
+        class default standing in for a value never set, and of the test
+        that it is a number"""
+        default = classes['Place']._defaults[field]
+        path = "'$.{}'".format(field)
+        return ("COALESCE(json_extract(data, {}), {})".format(path, default),
+                "COALESCE(json_type(data, {}), '{}') IN ('integer', 'real')"
+                .format(path, 'real' if isinstance(default, float)
+                        else 'integer'))
+
+    @staticmethod
+    def __names(cls):
+        """Returns the class names matched by cls, a class or a name"""
+        if cls is None:
+            return list(classes)
+        if isinstance(cls, str):
+            return [cls] if cls in classes else []
+        return [name for name, kind in classes.items()
+                if issubclass(kind, cls)]
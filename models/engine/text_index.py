@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""In-process full-text index with BM25 ranking
+
+Texts are lowercased and split on word characters. Each term keeps a
+posting list of the documents it appears in with its frequency there,
+and each document keeps its own term frequencies so it can be removed
+or updated without rescanning the index.
+"""
+import heapq
+import json
+import math
+import re
+from collections import Counter
+
+text_fields = {"Review": ("text",), "Place": ("name", "description"),
+               "City": ("name",), "State": ("name",)}
+_word = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Returns the terms of text"""
+    return _word.findall(str(text).lower())
+
+
+class TextIndex:
+    """Posting lists of terms over documents keyed by storage key"""
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, docs=()):
+        """Builds the index of docs, an iterable of (key, texts)"""
+        self.__docs = {}
+        self.__lengths = {}
+        self.__postings = {}
+        self.__total = 0
+        for key, texts in docs:
+            self.add(key, texts)
+
+    def __len__(self):
+        """Returns the number of indexed documents"""
+        return len(self.__docs)
+
+    def add(self, key, texts):
+        """Indexes the texts of the document key, replacing any older
+        version of it"""
+        terms = Counter()
+        for text in texts:
+            if text:
+                terms.update(tokenize(text))
+        old = self.__docs.get(key)
+        if old is not None:
+            if old == terms:
+                return
+            self.remove(key)
+        self.__insert(key, dict(terms))
+
+    def remove(self, key):
+        """Drops the document key, if indexed"""
+        terms = self.__docs.pop(key, None)
+        if terms is None:
+            return
+        self.__total -= self.__lengths.pop(key)
+        for term in terms:
+            posting = self.__postings[term]
+            del posting[key]
+            if not posting:
+                del self.__postings[term]
+
+    def search(self, query, names=None, limit=20):
+        """Returns the (score, key) of the best limit documents for the
+        terms of query, only among the classes in names if given"""
+        count = len(self.__docs)
+        if not count:
+            return []
+        average = self.__total / count or 1
+        lengths = self.__lengths
+        scores = {}
+        for term in set(tokenize(query)):
+            posting = self.__postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) /
+                           (len(posting) + 0.5))
+            for key, tf in posting.items():
+                if names is not None and key.partition('.')[0] not in names:
+                    continue
+                scores[key] = scores.get(key, 0) + idf * tf * (
+                    self.k1 + 1) / (tf + self.k1 * (
+                        1 - self.b + self.b * lengths[key] / average))
+        ranked = heapq.nsmallest(limit, scores.items(),
+                                 key=lambda item: (-item[1], item[0]))
+        return [(score, key) for key, score in ranked]
+
+    def dump(self, f, mark=None):
+        """Writes the index to the text file f, with mark to tell which
+        data it was built from"""
+        json.dump({'mark': mark, 'docs': self.__docs}, f)
+
+    @classmethod
+    def load(cls, f):
+        """Returns the mark and the index read from the text file f"""
+        data = json.load(f)
+        index = cls()
+        for key, terms in data['docs'].items():
+            index.__insert(key, terms)
+        return data['mark'], index
+
+    def __insert(self, key, terms):
+        """Adds a document that is not in the index"""
+        self.__docs[key] = terms
+        self.__lengths[key] = sum(terms.values())
+        self.__total += self.__lengths[key]
+        for term, tf in terms.items():
+            self.__postings.setdefault(term, {})[key] = tf
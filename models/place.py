@@ -5,14 +5,24 @@ from models.base_model import BaseModel
 
 class Place(BaseModel):
     """ A place to stay in """
-    city_id = ""
-    user_id = ""
-    name = ""
-    description = ""
-    number_rooms = 0
-    number_bathrooms = 0
-    max_guest = 0
-    price_by_night = 0
-    latitude = 0.0
-    longitude = 0.0
-    amenity_ids = []
+    _defaults = {
+        'city_id': "",
+        'user_id': "",
+        'name': "",
+        'description': "",
+        'number_rooms': 0,
+        'number_bathrooms': 0,
+        'max_guest': 0,
+        'price_by_night': 0,
+        'latitude': 0.0,
+        'longitude': 0.0,
+        'amenity_ids': [],
+    }
+    __slots__ = tuple(_defaults)
+
+    @property
+    def reviews(self):
+        """ List of the Review objects of this Place """
+        from models import storage
+        from models.review import Review
+        return list(storage.by_fk(Review, 'place_id', self.id).values())
@@ -5,6 +5,5 @@ from models.base_model import BaseModel
 
 class Review(BaseModel):
     """ Review class to  store review """
-    place_id = ""
-    user_id = ""
-    text = ""
+    _defaults = {'place_id': "", 'user_id': "", 'text': ""}
+    __slots__ = tuple(_defaults)
@@ -5,4 +5,12 @@ from models.base_model import BaseModel
 
 class State(BaseModel):
     """ State class name """
-    name = ""
+    _defaults = {'name': ""}
+    __slots__ = tuple(_defaults)
+
+    @property
+    def cities(self):
+        """ List of the City objects of this State """
+        from models import storage
+        from models.city import City
+        return list(storage.by_fk(City, 'state_id', self.id).values())
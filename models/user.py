@@ -5,7 +5,20 @@ from models.base_model import BaseModel
 
 class User(BaseModel):
     """ defines a user by various attributes"""
-    email = ''
-    password = ''
-    first_name = ''
-    last_name = ''
+    _defaults = {'email': '', 'password': '', 'first_name': '',
+                 'last_name': ''}
+    __slots__ = tuple(_defaults)
+
+    @property
+    def places(self):
+        """ List of the Place objects owned by this User """
+        from models import storage
+        from models.place import Place
+        return list(storage.by_fk(Place, 'user_id', self.id).values())
+
+    @property
+    def reviews(self):
+        """ List of the Review objects written by this User """
+        from models import storage
+        from models.review import Review
+        return list(storage.by_fk(Review, 'user_id', self.id).values())
@@ -2,6 +2,7 @@
 """Defines unittests for console.py."""
 import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import patch
 from io import StringIO
@@ -10,6 +11,8 @@ from io import StringIO
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from console import HBNBCommand  # noqa: E402
+from models import storage  # noqa: E402
+from models.state import State  # noqa: E402
 from models.engine.file_storage import FileStorage  # noqa: E402
 
 
@@ -130,6 +133,61 @@ class TestHBNBCommand(unittest.TestCase):
             self.assertIn("'latitude': 37.77", output)
             self.assertIn("'longitude': 43.434'", output)
 
+    def test_import_for_errors(self):
+        """Test import command errors."""
+        with patch("sys.stdout", new=StringIO()) as f:
+            self.HBNB.onecmd("import")
+            self.assertEqual("** file name missing **\n", f.getvalue())
+        with patch("sys.stdout", new=StringIO()) as f:
+            self.HBNB.onecmd("import nope.jsonl")
+            self.assertEqual("** file doesn't exist **\n", f.getvalue())
+        with patch("sys.stdout", new=StringIO()) as f:
+            self.HBNB.onecmd("import nope.jsonl Nope")
+            self.assertEqual("** class doesn't exist **\n", f.getvalue())
+
+    def test_import_json_lines(self):
+        """Test import command with a JSON Lines file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "states.jsonl")
+            with open(path, "w") as f:
+                f.write('{"__class__": "State", "id": "s1", "name": "CA"}\n'
+                        '\n{"name": "Nevada"}\nnot json\n'
+                        '{"__class__": "Nope"}\n'
+                        '{"__class__": "State", "id": 7, "name": "Bad"}\n'
+                        '{"__class__": "State", "created_at": 5}\n'
+                        '{"__class__": "State", "updated_at": "today"}\n')
+            with patch.object(HBNBCommand, "import_batch", 1), \
+                    patch("sys.stdout", new=StringIO()) as f:
+                self.HBNB.onecmd("import {} State".format(path))
+            lines = f.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("1 objects imported ("))
+        self.assertTrue(lines[2].startswith("2 objects imported in "))
+        self.assertEqual(lines[3], "5 records skipped")
+        self.assertEqual(storage.get("State", "s1").name, "CA")
+        self.assertEqual(sorted(s.name for s in storage.all(State).values()),
+                         ["CA", "Nevada"])
+        with open("file.json") as f:
+            self.assertIn("Nevada", f.read())
+
+    def test_import_csv(self):
+        """Test import command with a CSV file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "places.csv")
+            with open(path, "w") as f:
+                f.write("id,name,number_rooms,latitude,city_id\n"
+                        "p1,My house,4,37.77,\n"
+                        "123,Flat,2,0.5,0042\n")
+            with patch("sys.stdout", new=StringIO()) as f:
+                self.HBNB.onecmd("import {} Place".format(path))
+        place = storage.get("Place", "p1")
+        self.assertEqual(place.name, "My house")
+        self.assertEqual(place.number_rooms, 4)
+        self.assertEqual(place.latitude, 37.77)
+        self.assertEqual(place.city_id, "")
+        place = storage.get("Place", "123")
+        self.assertEqual(place.latitude, 0.5)
+        self.assertEqual(place.city_id, "0042")
+
 
 if __name__ == "__main__":
     unittest.main()
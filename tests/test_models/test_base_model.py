@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+""" Module for testing the compact model storage"""
+import unittest
+from models.base_model import BaseModel
+from models.place import Place
+from models.state import State
+
+
+class test_basemodel(unittest.TestCase):
+    """ Class to test the slot based models """
+
+    def test_no_instance_dict(self):
+        """ Declared attributes live in slots """
+        new = State()
+        new.name = "Nevada"
+        self.assertFalse(hasattr(new, '__dict__'))
+        self.assertEqual(new.name, "Nevada")
+
+    def test_defaults(self):
+        """ Unset attributes fall back on the class defaults """
+        new = Place()
+        self.assertEqual(new.number_rooms, 0)
+        self.assertNotIn('number_rooms', new.to_dict())
+
+    def test_amenity_ids_not_shared(self):
+        """ Each Place gets its own amenity_ids list """
+        first, second = Place(), Place()
+        first.amenity_ids.append("wifi")
+        self.assertEqual(first.amenity_ids, ["wifi"])
+        self.assertEqual(second.amenity_ids, [])
+
+    def test_extra_attributes(self):
+        """ Undeclared attributes are kept and serialized """
+        new = State()
+        new.motto = "Eureka"
+        self.assertEqual(new.motto, "Eureka")
+        self.assertEqual(new.to_dict()['motto'], "Eureka")
+        self.assertIn("'motto': 'Eureka'", str(new))
+
+    def test_kwargs_round_trip(self):
+        """ An object rebuilt from to_dict() has the same attributes """
+        new = Place()
+        new.name = "Loft"
+        new.latitude = 37.77
+        new.vibe = "quiet"
+        copy = Place(**new.to_dict())
+        self.assertEqual(copy.to_dict(), new.to_dict())
+        self.assertEqual(str(copy), str(new))
+
+    def test_missing_attribute(self):
+        """ Unknown attributes still raise AttributeError """
+        with self.assertRaises(AttributeError):
+            BaseModel().nothing
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+""" Module for testing the asyncio storage front"""
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.state import State
+from models.engine.async_storage import AsyncStorage
+from models.engine.sqlite_storage import SQLiteStorage
+
+
+class test_asyncStorage(unittest.TestCase):
+    """ Class to test AsyncStorage over SQLiteStorage """
+
+    def setUp(self):
+        """ Wrap a fresh SQLite database """
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'hbnb.db')
+        with patch.dict(os.environ, {'HBNB_SQLITE_PATH': self.path}):
+            self.engine = SQLiteStorage()
+        self.engine.reload()
+        self.storage = AsyncStorage(self.engine, workers=2)
+
+    def tearDown(self):
+        """ Remove the database files """
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def test_write_then_read(self):
+        """ new and save share a session, reads see the commit """
+        state = State()
+        state.name = "Ohio"
+
+        async def scenario():
+            await self.storage.new(state)
+            await self.storage.save()
+            await self.storage.close()
+            return (await self.storage.get(State, state.id),
+                    await self.storage.count(),
+                    await self.storage.all(State))
+        found, count, states = asyncio.run(scenario())
+        self.assertEqual(found.name, "Ohio")
+        self.assertEqual(count, 1)
+        self.assertEqual(list(states), ['State.' + state.id])
+
+    def test_delete(self):
+        """ delete and save remove the row """
+        state = State()
+
+        async def scenario():
+            await self.storage.new(state)
+            await self.storage.save()
+            await self.storage.delete(state)
+            await self.storage.save()
+            return await self.storage.count(State)
+        self.assertEqual(asyncio.run(scenario()), 0)
+
+    def test_close_writer(self):
+        """ close() empties the write session once its writes are saved,
+        and keeps writes still waiting for a save """
+        saved, staged = State(), State()
+
+        def session(engine):
+            return dict(engine._SQLiteStorage__session()['objects'])
+
+        async def scenario():
+            await self.storage.new(saved)
+            await self.storage.save()
+            await self.storage.close()
+            after_save = await self.storage.run(session)
+            await self.storage.new(staged)
+            await self.storage.close()
+            await self.storage.save()
+            await self.storage.close()
+            return after_save, await self.storage.count(State)
+        after_save, count = asyncio.run(scenario())
+        self.assertEqual(after_save, {})
+        self.assertEqual(count, 2)
+
+    def test_concurrent_queries(self):
+        """ Concurrent queries on one event loop all get their results """
+        state = State()
+        state.name = "Iowa"
+        city = City()
+        city.state_id = state.id
+
+        async def scenario():
+            await self.storage.run(lambda s: (s.new(state), s.new(city),
+                                              s.save()))
+            return await asyncio.gather(*(
+                self.storage.query(City, filters={'state_id': state.id})
+                for _ in range(8)))
+        for cities in asyncio.run(scenario()):
+            self.assertEqual([c.id for c in cities], [city.id])
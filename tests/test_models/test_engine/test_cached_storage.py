@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+""" Module for testing the read-through storage cache"""
+import os
+import tempfile
+import time
+import unittest
+import models
+from unittest.mock import patch
+from models.city import City
+from models.state import State
+from models.engine.cached_storage import CachedStorage
+from models.engine.sqlite_storage import SQLiteStorage
+
+
+class test_cachedStorage(unittest.TestCase):
+    """ Class to test the cache in front of a storage engine """
+
+    def setUp(self):
+        """ Wrap a fresh SQLite database """
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'hbnb.db')
+        with patch.dict(os.environ, {'HBNB_SQLITE_PATH': self.path}):
+            self.engine = SQLiteStorage()
+        self.storage = CachedStorage(self.engine, maxsize=4, ttl=60)
+        self.storage.reload()
+        self.state = State()
+        self.storage.new(self.state)
+        self.storage.save()
+
+    def tearDown(self):
+        """ Remove the database files """
+        self.storage.close()
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def test_hit(self):
+        """ A repeated read is served from the cache """
+        first = self.storage.all(State)
+        queries = self.engine.query_count
+        self.assertIs(self.storage.all(State), first)
+        self.assertEqual(self.engine.query_count, queries)
+        self.assertEqual((self.storage.hits, self.storage.misses), (1, 1))
+
+    def test_write_invalidates(self):
+        """ new, delete and save drop the entries of the class """
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.count(City), 0)
+        state = State()
+        self.storage.new(state)
+        self.assertEqual(self.storage.count(State), 2)
+        self.storage.count(City)
+        self.assertEqual(self.storage.hits, 1)
+        self.storage.delete(state)
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.count(), 1)
+        self.storage.save()
+        self.assertEqual(self.storage.count(), 1)
+        self.assertEqual(self.storage.misses, 6)
+
+    def test_fk_update_invalidates(self):
+        """ Changing a foreign key drops the cached by_fk results """
+        storage = CachedStorage(models.storage)
+        city = City()
+        self.assertEqual(storage.by_fk(City, 'state_id', self.state.id), {})
+        with patch('models.base_model.storage', storage):
+            city.state_id = self.state.id
+        self.assertEqual(list(storage.by_fk(City, 'state_id',
+                                            self.state.id)),
+                         ['City.' + city.id])
+        models.storage.delete(city)
+
+    def test_query(self):
+        """ Cached queries can be iterated again """
+        for _ in range(2):
+            self.assertEqual([s.id for s in self.storage.query(
+                State, order_by='name')], [self.state.id])
+        self.assertEqual(self.storage.hits, 1)
+
+    def test_lru_bound(self):
+        """ The least recently used entry is evicted first """
+        self.storage.get(State, self.state.id)
+        for i in range(4):
+            self.storage.get(State, str(i))
+        self.storage.get(State, '3')
+        self.storage.get(State, self.state.id)
+        self.assertEqual((self.storage.hits, self.storage.misses), (1, 6))
+
+    def test_ttl(self):
+        """ Entries expire after ttl seconds """
+        self.storage.ttl = 0.01
+        self.storage.count(State)
+        time.sleep(0.02)
+        self.storage.count(State)
+        self.assertEqual(self.storage.misses, 2)
+
+    def test_reload_clears(self):
+        """ reload() empties the cache """
+        self.storage.count(State)
+        self.storage.reload()
+        self.storage.count(State)
+        self.assertEqual(self.storage.misses, 2)
+
+    def test_close_sees_other_writers(self):
+        """ close() drops the cache once the engine saw outside writes """
+        self.state.name = "Old"
+        self.storage.new(self.state)
+        self.storage.save()
+        self.assertEqual([s.name for s in self.storage.query(State)],
+                         ["Old"])
+        with patch.dict(os.environ, {'HBNB_SQLITE_PATH': self.path}):
+            other = SQLiteStorage()
+        state = other.get(State, self.state.id)
+        state.name = "New"
+        other.new(state)
+        other.save()
+        other.close()
+        self.storage.close()
+        self.assertEqual([s.name for s in self.storage.query(State)],
+                         ["New"])
+
+    def test_write_during_read(self):
+        """ A result read while a write invalidates it is not cached """
+        count = self.engine.count
+
+        def racing(cls=None):
+            """ count() with a write landing while it runs """
+            result = count(cls)
+            self.storage.new(State())
+            return result
+
+        with patch.object(self.engine, 'count', racing):
+            self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.count(State), 2)
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+""" Module for testing the DBStorage pool options"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.engine.db_pool import pool_options
+try:
+    from sqlalchemy import create_engine
+except ImportError:
+    create_engine = None
+
+
+class test_poolOptions(unittest.TestCase):
+    """ Class to test the pool options read from the environment """
+
+    env = {'HBNB_MYSQL_POOL_SIZE': '3', 'HBNB_MYSQL_MAX_OVERFLOW': '2',
+           'HBNB_MYSQL_POOL_RECYCLE': '60', 'HBNB_MYSQL_POOL_PRE_PING': '1'}
+
+    def test_defaults(self):
+        """ No variable set means no option """
+        with patch.dict(os.environ):
+            for var in self.env:
+                os.environ.pop(var, None)
+            self.assertEqual(pool_options(), {})
+
+    def test_options(self):
+        """ Each variable sets its create_engine() option """
+        with patch.dict(os.environ, self.env):
+            self.assertEqual(pool_options(), {
+                'pool_size': 3, 'max_overflow': 2, 'pool_recycle': 60,
+                'pool_pre_ping': True})
+        with patch.dict(os.environ, {'HBNB_MYSQL_POOL_PRE_PING': '0'}):
+            self.assertFalse(pool_options()['pool_pre_ping'])
+
+    @unittest.skipIf(create_engine is None, "SQLAlchemy is not installed")
+    def test_engine(self):
+        """ create_engine() takes the options and its pool applies them """
+        with patch.dict(os.environ, self.env), \
+                tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine('sqlite:///' + os.path.join(tmp, 'db'),
+                                   **pool_options())
+            pool = engine.pool
+            self.assertEqual(pool.size(), 3)
+            self.assertEqual(pool._max_overflow, 2)
+            self.assertEqual(pool._recycle, 60)
+            self.assertTrue(pool._pre_ping)
+            with engine.connect():
+                self.assertEqual(pool.checkedout(), 1)
+            engine.dispose()
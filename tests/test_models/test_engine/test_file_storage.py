@@ -2,8 +2,20 @@
 """ Module for testing file storage"""
 import unittest
 from models.base_model import BaseModel
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.engine import binary_format
 from models import storage
+from models.engine.file_storage import FileStorage
+import io
+import json
 import os
+import random
+import struct
+import time
+from unittest.mock import patch
 
 
 class test_fileStorage(unittest.TestCase):
@@ -18,11 +30,20 @@ class test_fileStorage(unittest.TestCase):
             del storage._FileStorage__objects[key]
 
     def tearDown(self):
-        """ Remove storage file at end of tests """
-        try:
-            os.remove('file.json')
-        except:
-            pass
+        """ Remove the storage files and the indexes built from them """
+        for path in ('file.json', 'file.json.log', 'file.json.text',
+                     'file.hbnb'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        for name in ('text', 'places', 'geo', 'ranges', 'snapshot_mark',
+                     'text_mark', 'log_mark'):
+            setattr(FileStorage, '_FileStorage__' + name, None)
+        FileStorage._FileStorage__sorted.clear()
+        FileStorage._FileStorage__dirty.clear()
+        FileStorage._FileStorage__stale.clear()
+        FileStorage._FileStorage__log_entries = 0
 
     def test_obj_list_empty(self):
         """ __objects is initially empty """
@@ -107,3 +128,694 @@ class test_fileStorage(unittest.TestCase):
         from models.engine.file_storage import FileStorage
         #print(type(storage))
         self.assertEqual(type(storage), FileStorage)
+
+    def test_all_cls_matches_scan(self):
+        """ all(cls) returns what a full isinstance scan would """
+        objs = [State(), City(), State(), BaseModel(), City()]
+        for cls in (State, City, BaseModel):
+            expected = {k: v for k, v in storage.all().items()
+                        if isinstance(v, cls)}
+            self.assertEqual(dict(storage.all(cls)), expected)
+        self.assertEqual(len(storage.all(BaseModel)), len(objs))
+
+    def test_all_cls_read_only(self):
+        """ all(cls) is a read-only view of its partition """
+        new = State()
+        states = storage.all(State)
+        with self.assertRaises(TypeError):
+            states['State.x'] = new
+        other = State()
+        self.assertIn('State.' + other.id, states)
+
+    def test_all_cls_after_delete_and_reload(self):
+        """ Partitions follow delete and reload """
+        keep = State()
+        gone = State()
+        storage.delete(gone)
+        self.assertEqual(list(storage.all(State)), ['State.' + keep.id])
+        storage.reload()
+        self.assertIn('State.' + keep.id, storage.all(State))
+        self.assertNotIn('State.' + gone.id, storage.all(State))
+        self.assertEqual(len(storage.all(City)), 0)
+
+    def test_journal_appends_changes(self):
+        """ Journal mode appends changed objects instead of rewriting """
+        storage.journal, storage.journal_ratio = True, 10
+        try:
+            first = State()
+            first.save()
+            second = State()
+            second.save()
+            first.name = "Texas"
+            first.save()
+            storage.delete(second)
+            self.assertFalse(os.path.exists('file.json'))
+            with open('file.json.log') as f:
+                self.assertEqual(len(f.readlines()), 4)
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual(storage.all(State)['State.' + first.id].name,
+                             "Texas")
+            self.assertNotIn('State.' + second.id, storage.all())
+        finally:
+            storage.journal, storage.journal_ratio = False, 1
+            storage.save()
+
+    def test_journal_attribute_change(self):
+        """ Journal mode saves objects changed without new() """
+        storage.journal, storage.journal_ratio = True, 10
+        try:
+            state = State()
+            state.name = "A"
+            storage.save()
+            state.name = "B"
+            storage.save()
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual(storage.all(State)['State.' + state.id].name,
+                             "B")
+        finally:
+            storage.journal, storage.journal_ratio = False, 1
+            storage.save()
+
+    def test_watched(self):
+        """ Only stored objects report attribute writes, and a failed
+        write keeps them pending """
+        state = State()
+        copy = State(**state.to_dict())
+        with patch.object(storage, 'touch') as touch:
+            copy.name = "A"
+            touch.assert_not_called()
+            state.name = "A"
+            touch.assert_called_once_with(state)
+        storage.delete(state)
+        self.assertIsNone(state._watched)
+        state = State()
+        with patch.object(FileStorage, '_FileStorage__write_snapshot',
+                          side_effect=OSError):
+            with self.assertRaises(OSError):
+                storage.save()
+        self.assertIn('State.' + state.id, storage._FileStorage__dirty)
+
+    def test_flush_fsyncs(self):
+        """ flush() syncs the files it writes and their directory, save()
+        does not """
+        State()
+        with patch('os.fsync') as fsync:
+            storage.save()
+            self.assertEqual(fsync.call_count, 0)
+            storage.flush()
+            self.assertEqual(fsync.call_count, 2)
+            storage.journal, storage.journal_ratio = True, 10
+            try:
+                State()
+                storage.sync()
+                self.assertEqual(fsync.call_count, 4)
+                self.assertTrue(os.path.exists('file.json.log'))
+            finally:
+                storage.journal, storage.journal_ratio = False, 1
+                storage.save()
+
+    def test_journal_compaction(self):
+        """ The log is folded into the snapshot past the ratio """
+        storage.journal, storage.journal_ratio = True, 2
+        try:
+            new = State()
+            new.save()
+            new.save()
+            self.assertTrue(os.path.exists('file.json.log'))
+            new.save()
+            self.assertFalse(os.path.exists('file.json.log'))
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertIn('State.' + new.id, storage.all(State))
+        finally:
+            storage.journal, storage.journal_ratio = False, 1
+            storage.save()
+
+    def test_write_behind_flush(self):
+        """ Write-behind save defers the write until a flush """
+        storage.write_behind, storage.flush_ms = True, 60000
+        try:
+            new = State()
+            new.save()
+            self.assertFalse(os.path.exists('file.json'))
+            storage.flush()
+            self.assertTrue(os.path.exists('file.json'))
+            with open('file.json') as f:
+                self.assertIn('State.' + new.id, f.read())
+        finally:
+            storage.write_behind, storage.flush_ms = False, 100
+
+    def test_write_behind_change_limit(self):
+        """ The flusher writes once enough changes pile up """
+        storage.write_behind = True
+        storage.flush_ms, storage.flush_changes = 60000, 3
+        try:
+            for i in range(3):
+                State().save()
+            for i in range(100):
+                if os.path.exists('file.json'):
+                    break
+                time.sleep(0.01)
+            self.assertTrue(os.path.exists('file.json'))
+        finally:
+            storage.write_behind = False
+            storage.flush_ms, storage.flush_changes = 100, 100
+            storage.flush()
+
+    def test_lazy_reload(self):
+        """ Lazy reload only builds the classes that are asked for """
+        state = State()
+        city = City()
+        storage.save()
+        storage._FileStorage__objects.clear()
+        storage.lazy = True
+        try:
+            storage.reload()
+            self.assertEqual(len(storage._FileStorage__objects), 0)
+            self.assertEqual(list(storage.all(City)), ['City.' + city.id])
+            self.assertNotIn('State.' + state.id,
+                             storage._FileStorage__objects)
+            storage.save()
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual(set(storage.all()),
+                             {'State.' + state.id, 'City.' + city.id})
+        finally:
+            storage.lazy = False
+
+    def test_close_skips_unchanged_file(self):
+        """ close() does not re-read a file that has not changed """
+        State().save()
+        stats = storage.reload_stats
+        skipped, full = stats['skipped'], stats['full']
+        storage.close()
+        storage.close()
+        self.assertEqual(stats['skipped'], skipped + 2)
+        self.assertEqual(stats['full'], full)
+        with open('file.json', 'w') as f:
+            f.write('{}')
+        storage.close()
+        self.assertEqual(stats['full'], full + 1)
+
+    def test_close_replays_log_tail(self):
+        """ Only the appended part of the log is replayed """
+        storage.journal, storage.journal_ratio = True, 10
+        try:
+            first = State()
+            first.save()
+            record = dict(first.to_dict(), id='other-process')
+            with open('file.json.log', 'a') as f:
+                f.write(json.dumps({'key': 'State.other-process',
+                                    'value': record}) + '\n')
+            incremental = storage.reload_stats['incremental']
+            storage.close()
+            self.assertEqual(storage.reload_stats['incremental'],
+                             incremental + 1)
+            self.assertIn('State.other-process', storage.all(State))
+        finally:
+            storage.journal, storage.journal_ratio = False, 1
+            storage.save()
+
+    def test_stream_round_trip(self):
+        """ Streamed save and reload match the regular format """
+        states = [State() for i in range(5)]
+        storage.stream = True
+        try:
+            storage.save()
+            with open('file.json') as f:
+                self.assertEqual(set(json.load(f)),
+                                 {'State.' + s.id for s in states})
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual(set(storage.all(State)),
+                             {'State.' + s.id for s in states})
+        finally:
+            storage.stream = False
+
+    def test_stream_reload_empty(self):
+        """ Streamed load from an empty file """
+        open('file.json', 'w').close()
+        storage.stream = True
+        try:
+            with self.assertRaises(ValueError):
+                storage.reload()
+        finally:
+            storage.stream = False
+
+    def test_binary_round_trip(self):
+        """ The binary format reloads the same attributes """
+        place = Place()
+        place.name = "Loft"
+        place.price_by_night = 120
+        place.latitude = 37.77
+        place.amenity_ids = ["a", "b"]
+        State()
+        expected = {k: v.to_dict() for k, v in storage.all().items()}
+        storage.format = 'binary'
+        try:
+            storage.save()
+            self.assertTrue(binary_format.is_binary('file.hbnb'))
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual({k: v.to_dict()
+                              for k, v in storage.all().items()}, expected)
+            self.assertEqual(type(storage.all()['Place.' + place.id]
+                                  .created_at), type(place.created_at))
+        finally:
+            storage.format = 'json'
+            os.remove('file.hbnb')
+
+    def test_binary_emptied_class(self):
+        """ The binary format reloads after the last object of a class
+        is deleted """
+        state = State()
+        city = City()
+        storage.format = 'binary'
+        try:
+            storage.save()
+            storage.delete(state)
+            storage._FileStorage__objects.clear()
+            storage.reload()
+            self.assertEqual(list(storage.all()), ['City.' + city.id])
+        finally:
+            storage.format = 'json'
+            os.remove('file.hbnb')
+        empty = io.BytesIO(binary_format.MAGIC + struct.pack(
+            '<HIH', binary_format.VERSION, 1, 5) + b'State' +
+            struct.pack('<IH', 0, 0))
+        self.assertEqual(list(binary_format.load(empty)), [])
+
+    def test_binary_converter(self):
+        """ file.json converts to the binary format and back """
+        new = Place()
+        new.max_guest = 4
+        State()
+        storage.save()
+        with open('file.json') as f:
+            expected = json.load(f)
+        try:
+            binary_format.convert('file.json', 'file.hbnb')
+            os.remove('file.json')
+            binary_format.convert('file.hbnb', 'file.json')
+            with open('file.json') as f:
+                self.assertEqual(json.load(f), expected)
+        finally:
+            os.remove('file.hbnb')
+
+    def test_by_fk(self):
+        """ Foreign key indexes follow new, updates and delete """
+        state = State()
+        other = State()
+        city = City()
+        city.state_id = state.id
+        self.assertEqual(list(storage.by_fk(City, 'state_id', state.id)),
+                         ['City.' + city.id])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+
+    def test_reindex_only_foreign_keys(self):
+        """ Only a new value of an indexed foreign key is reindexed """
+        city = City()
+        with patch.object(storage, 'reindex') as reindex:
+            city.name = "Reno"
+            city.other_id = "x"
+            city.state_id = city.state_id
+            reindex.assert_not_called()
+            city.state_id = "s"
+            reindex.assert_called_once_with(city, 'state_id', "")
+
+    def test_by_fk_after_reload(self):
+        """ Foreign key indexes are rebuilt by reload """
+        state = State()
+        city = City()
+        city.state_id = state.id
+        storage.save()
+        storage._FileStorage__objects.clear()
+        storage.reload()
+        cities = state.cities
+        self.assertEqual([c.id for c in cities], [city.id])
+        self.assertIsNot(cities[0], city)
+
+    def test_query(self):
+        """ query() filters, orders and pages like all() plus sorted() """
+        names = ["Ohio", "Iowa", "Utah", "Maine", "Idaho"]
+        for name in names:
+            State().name = name
+        result = [s.name for s in storage.query(State, order_by='name')]
+        self.assertEqual(result, sorted(names))
+        result = [s.name for s in storage.query(State, order_by='-name',
+                                                limit=2, offset=1)]
+        self.assertEqual(result, sorted(names, reverse=True)[1:3])
+        result = [s.name for s in storage.query(State,
+                                                filters={'name': "Utah"})]
+        self.assertEqual(result, ["Utah"])
+
+    def test_query_fk_filter(self):
+        """ query() uses the foreign key index for fk filters """
+        state = State()
+        cities = [City() for i in range(3)]
+        for i, city in enumerate(cities):
+            city.name = str(2 - i)
+        cities[0].state_id = cities[1].state_id = state.id
+        result = list(storage.query(City, filters={'state_id': state.id},
+                                    order_by='name'))
+        self.assertEqual(result, [cities[1], cities[0]])
+
+    def test_get_and_count(self):
+        """ get(), get_many() and count() match all() """
+        states = [State() for i in range(3)]
+        City()
+        self.assertIs(storage.get(State, states[0].id), states[0])
+        self.assertIs(storage.get('State', states[1].id), states[1])
+        self.assertIsNone(storage.get(City, states[0].id))
+        self.assertIsNone(storage.get(State, 'nope'))
+        self.assertEqual(storage.get_many(State, [s.id for s in states[1:]]
+                                          + ['nope']),
+                         {'State.' + s.id: s for s in states[1:]})
+        self.assertEqual(storage.count(), len(storage.all()))
+        self.assertEqual(storage.count(State), 3)
+        self.assertEqual(storage.count(BaseModel), 4)
+
+    def test_get_and_count_lazy(self):
+        """ count() builds nothing and get() builds one object """
+        states = [State() for i in range(3)]
+        storage.save()
+        storage._FileStorage__objects.clear()
+        storage.lazy = True
+        try:
+            storage.reload()
+            self.assertEqual(storage.count(State), 3)
+            self.assertEqual(len(storage._FileStorage__objects), 0)
+            self.assertEqual(storage.get(State, states[0].id).id,
+                             states[0].id)
+            self.assertEqual(len(storage._FileStorage__objects), 1)
+            self.assertEqual(storage.count(State), 3)
+        finally:
+            storage.all()
+            storage.lazy = False
+
+    def test_bulk(self):
+        """ bulk_new registers many objects, bulk_delete saves once """
+        record = State().to_dict()
+        storage.all().clear()
+        states = [State(**dict(record, id=str(i))) for i in range(5)]
+        storage.bulk_new(states)
+        self.assertEqual(storage.count(State), 5)
+        storage.save()
+        storage.bulk_delete(states[:3])
+        self.assertEqual(storage.count(State), 2)
+        storage.all().clear()
+        storage.reload()
+        self.assertEqual(set(storage.all(State)), {'State.3', 'State.4'})
+
+    def test_version(self):
+        """ version goes up on changes and not on idle reloads """
+        storage.save()
+        storage.reload()
+        version = storage.version
+        storage.reload()
+        self.assertEqual(storage.version, version)
+        state = State()
+        self.assertGreater(storage.version, version)
+        version = storage.version
+        storage.delete(state)
+        self.assertGreater(storage.version, version)
+        version = storage.version
+        with open('file.json', 'w') as f:
+            f.write('{}')
+        storage.reload()
+        self.assertGreater(storage.version, version)
+
+    def test_page(self):
+        """ page() walks a class in id order, a bounded page at a time """
+        record = State().to_dict()
+        storage.all().clear()
+        states = [State(**dict(record, id='{:02}'.format(i)))
+                  for i in range(25)]
+        storage.bulk_new(reversed(states))
+        City()
+        first = storage.page(State, 10)
+        self.assertEqual(first, states[:10])
+        self.assertEqual(storage.page(State, 10, first[-1].id), states[10:20])
+        self.assertEqual(storage.page('State', 10, '19'), states[20:])
+        self.assertEqual(storage.page(State, 10, '24'), [])
+        storage.delete(states[20])
+        self.assertEqual(storage.page(State, 10, '19'), states[21:])
+
+    def test_search_places(self):
+        """ search_places() matches amenities, cities and states, and
+        follows writes """
+        storage.all().clear()
+        state, other = State(), State()
+        city, far = City(), City()
+        city.state_id = state.id
+        far.state_id = other.id
+        places = [Place() for i in range(4)]
+        for place, (city_id, amenity_ids) in zip(places, (
+                (city.id, ['wifi', 'pool']), (city.id, ['wifi']),
+                (far.id, ['wifi', 'pool']), (far.id, []))):
+            place.city_id = city_id
+            place.amenity_ids = amenity_ids
+        ids = sorted(p.id for p in places)
+        self.assertEqual([p.id for p in storage.search_places()], ids)
+        self.assertEqual(storage.search_places(cities=[city.id],
+                                               amenities=['wifi', 'pool']),
+                         [places[0]])
+        self.assertEqual(storage.search_places(states=[other.id],
+                                               amenities=['pool']),
+                         [places[2]])
+        self.assertEqual(storage.search_places(amenities=['spa']), [])
+        places[3].amenity_ids.append('pool')
+        places[3].save()
+        storage.delete(places[2])
+        self.assertEqual(storage.search_places(states=[other.id],
+                                               amenities=['pool']),
+                         [places[3]])
+        extra = Place()
+        extra.amenity_ids = ['pool']
+        storage.new(extra)
+        self.assertIn(extra, storage.search_places(amenities=['pool']))
+
+    def test_search_places_attribute_change(self):
+        """ search_places() follows amenities set without new() """
+        place = Place()
+        place.amenity_ids = ['wifi']
+        storage.save()
+        self.assertEqual(storage.search_places(amenities=['wifi']), [place])
+        place.amenity_ids = ['pool']
+        self.assertEqual(storage.search_places(amenities=['wifi']), [])
+        place.amenity_ids = ['spa']
+        storage.save()
+        self.assertEqual(storage.search_places(amenities=['pool']), [])
+        self.assertEqual(storage.search_places(amenities=['spa']), [place])
+
+    def test_nearby(self):
+        """ nearby() finds the places within the radius, nearest first,
+        and follows writes """
+        storage.all().clear()
+        points = [(48.8566, 2.3522), (48.8606, 2.3376), (48.9, 2.25),
+                  (51.5074, -0.1278), (-33.87, 151.21)]
+        places = []
+        for lat, lon in points:
+            place = Place()
+            place.latitude, place.longitude = lat, lon
+            places.append(place)
+        found = storage.nearby(48.8566, 2.3522, 10)
+        self.assertEqual([p for d, p in found], places[:3])
+        self.assertEqual(found[0][0], 0)
+        self.assertAlmostEqual(found[1][0], 1.16, places=2)
+        self.assertEqual(len(storage.nearby(48.8566, 2.3522, 400)), 4)
+        self.assertEqual(len(storage.nearby(48.8566, 2.3522, 400, 2)), 2)
+        places[2].latitude = 51.5
+        places[2].save()
+        storage.delete(places[1])
+        self.assertEqual([p for d, p in storage.nearby(48.8566, 2.3522,
+                                                       10)], places[:1])
+        places[4].latitude, places[4].longitude = 0.0, 179.95
+        places[4].save()
+        self.assertEqual([p for d, p in storage.nearby(0.0, -179.95, 20)],
+                         places[4:])
+
+    def test_nearby_attribute_change(self):
+        """ nearby() follows positions set without new() """
+        place = Place()
+        place.latitude, place.longitude = 10.0, 10.0
+        storage.save()
+        self.assertEqual(storage.nearby(10, 10, 1), [(0.0, place)])
+        place.latitude = 50.0
+        storage.save()
+        self.assertEqual(storage.nearby(10, 10, 1), [])
+        self.assertEqual(storage.nearby(50, 10, 1), [(0.0, place)])
+
+    def test_search_text(self):
+        """ search_text() ranks with BM25, follows writes and is loaded
+        back instead of rebuilt """
+        storage.all().clear()
+        place = Place()
+        place.name = "Cozy loft"
+        place.description = "A quiet loft near the river"
+        review = Review()
+        review.text = "Quiet and cozy, quiet street, quiet nights."
+        city = City()
+        city.name = "Quiet Falls"
+        found = storage.search_text("quiet")
+        self.assertEqual([obj for score, obj in found],
+                         [review, city, place])
+        self.assertEqual([obj for score, obj in storage.search_text(
+            "cozy", ['Place'])], [place])
+        self.assertEqual(storage.search_text("nothing"), [])
+        review.text = "Noisy"
+        review.save()
+        self.assertEqual(storage.search_text("noisy")[0][1], review)
+        self.assertNotIn(review, [o for s, o in storage.search_text("quiet")])
+        storage.delete(city)
+        storage.save()
+        self.assertFalse(os.path.exists('file.json.text'))
+        storage.close()
+        self.assertTrue(os.path.exists('file.json.text'))
+        with patch('models.engine.file_storage.TextIndex.dump') as dump:
+            storage.close()
+        dump.assert_not_called()
+        storage.all().clear()
+        storage.reload()
+        with patch('models.engine.file_storage.TextIndex.add') as add:
+            found = storage.search_text("quiet")
+        add.assert_not_called()
+        self.assertEqual([obj.id for score, obj in found], [place.id])
+
+    def test_search_text_attribute_change(self):
+        """ search_text() follows texts set without new(), and close()
+        saves the index of the new texts """
+        review = Review()
+        review.text = "hello"
+        storage.save()
+        self.assertEqual(storage.search_text("hello")[0][1], review)
+        review.text = "bye"
+        storage.save()
+        self.assertEqual(storage.search_text("hello"), [])
+        self.assertEqual(storage.search_text("bye")[0][1], review)
+        storage.close()
+        storage.all().clear()
+        storage.reload()
+        with patch('models.engine.file_storage.TextIndex.add') as add:
+            found = storage.search_text("bye")
+        add.assert_not_called()
+        self.assertEqual([obj.id for score, obj in found], [review.id])
+        self.assertEqual(storage.search_text("hello"), [])
+
+    def test_text_saved_on_compaction(self):
+        """ In journal mode the text index is saved when the log is
+        compacted, not on every save """
+        storage.journal, storage.journal_ratio = True, 1
+        try:
+            state = State()
+            state.name = "Quiet"
+            storage.search_text("quiet")
+            storage.save()
+            self.assertTrue(os.path.exists('file.json.log'))
+            self.assertFalse(os.path.exists('file.json.text'))
+            state.name = "Calm"
+            storage.save()
+            self.assertFalse(os.path.exists('file.json.log'))
+            self.assertTrue(os.path.exists('file.json.text'))
+        finally:
+            storage.journal, storage.journal_ratio = False, 1
+            storage.save()
+
+    def test_range_places(self):
+        """ range_places() agrees with a full scan whichever index it
+        walks, and follows writes """
+        rng = random.Random(1)
+        storage.all().clear()
+        cities = [City().id for i in range(5)]
+        places = []
+        for i in range(300):
+            place = Place()
+            place.city_id = rng.choice(cities)
+            place.price_by_night = rng.randrange(20, 500)
+            place.max_guest = rng.randrange(1, 9)
+            place.number_rooms = rng.randrange(1, 5)
+            places.append(place)
+
+        def scan(ranges, cities, order_by, limit):
+            found = [p for p in places
+                     if all((low is None or getattr(p, f) >= low) and
+                            (high is None or getattr(p, f) <= high)
+                            for f, (low, high) in ranges.items()) and
+                     (not cities or p.city_id in cities)]
+            if order_by:
+                field = order_by.lstrip('-')
+                found.sort(key=lambda p: (getattr(p, field),
+                                          'Place.' + p.id),
+                           reverse=order_by.startswith('-'))
+            return found[:limit]
+
+        cases = [({'max_guest': (4, None)}, cities[:2], 'price_by_night',
+                  20),
+                 ({'max_guest': (8, 8), 'number_rooms': (4, 4)}, (),
+                  'price_by_night', 5),
+                 ({'price_by_night': (100, 200)}, (), '-price_by_night', 10),
+                 ({}, (), '-max_guest', 7),
+                 ({'price_by_night': (None, 50)}, cities[:1], 'max_guest',
+                  None),
+                 ({'number_rooms': (2, 3)}, cities[2:], None, None)]
+        for ranges, city_ids, order_by, limit in cases:
+            found = storage.range_places(ranges, city_ids, order_by, limit)
+            expected = scan(ranges, city_ids, order_by, limit)
+            if order_by:
+                self.assertEqual(found, expected)
+            else:
+                self.assertEqual(set(found), set(expected))
+        cheapest = storage.range_places(order_by='price_by_night', limit=1)
+        cheapest[0].price_by_night = 10000
+        cheapest[0].save()
+        storage.delete(places[-1])
+        places.remove(cheapest[0])
+        places.pop()
+        self.assertEqual(storage.range_places(order_by='price_by_night',
+                                              limit=3),
+                         scan({}, (), 'price_by_night', 3))
+        with self.assertRaises(KeyError):
+            storage.range_places({'name': (None, None)})
+
+    def test_range_places_attribute_change(self):
+        """ range_places() follows values set without new() """
+        place = Place()
+        place.price_by_night = 10
+        place.save()
+        self.assertEqual(storage.range_places({'price_by_night': (0, 20)}),
+                         [place])
+        place.price_by_night = 100
+        storage.save()
+        storage.close()
+        self.assertEqual(storage.range_places({'price_by_night': (0, 20)}),
+                         [])
+        self.assertEqual(storage.range_places(
+            {'price_by_night': (50, None)}, order_by='price_by_night'),
+            [place])
+
+    def test_warm(self):
+        """ warm() builds every lazy object and index """
+        place = Place()
+        place.name = "Quiet loft"
+        place.latitude, place.longitude = 10.0, 20.0
+        place.price_by_night = 30
+        storage.save()
+        storage._FileStorage__objects.clear()
+        storage.lazy = True
+        try:
+            storage.reload()
+            storage.warm()
+            self.assertFalse(any(storage._FileStorage__raw.values()))
+            for name in ('places', 'geo', 'text', 'ranges'):
+                self.assertIsNotNone(
+                    getattr(storage, '_FileStorage__' + name))
+            self.assertEqual(storage.search_text('loft')[0][1].id, place.id)
+        finally:
+            storage.lazy = False
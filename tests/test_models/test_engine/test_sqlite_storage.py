@@ -0,0 +1,271 @@
+#!/usr/bin/python3
+""" Module for testing SQLite storage"""
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.engine.sqlite_storage import SQLiteStorage
+
+
+class test_sqliteStorage(unittest.TestCase):
+    """ Class to test the SQLite storage engine """
+
+    def setUp(self):
+        """ Use a fresh database file for every test """
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'hbnb.db')
+        with patch.dict(os.environ, {'HBNB_SQLITE_PATH': self.path}):
+            self.storage = SQLiteStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """ Remove the database files """
+        self.storage.close()
+        for name in os.listdir(self.tmp):
+            os.remove(os.path.join(self.tmp, name))
+        os.rmdir(self.tmp)
+
+    def test_wal_mode(self):
+        """ The database runs in WAL mode """
+        conn = sqlite3.connect(self.path)
+        mode, = conn.execute('PRAGMA journal_mode').fetchone()
+        conn.close()
+        self.assertEqual(mode, 'wal')
+
+    def test_new_save_all(self):
+        """ Saved objects are found by all(), by class or name """
+        state = State()
+        state.name = "Oregon"
+        city = City()
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.close()
+        states = self.storage.all(State)
+        self.assertEqual(list(states), ['State.' + state.id])
+        self.assertEqual(states['State.' + state.id].name, "Oregon")
+        self.assertEqual(set(self.storage.all()),
+                         {'State.' + state.id, 'City.' + city.id})
+        self.assertEqual(list(self.storage.all('City')), ['City.' + city.id])
+
+    def test_upsert(self):
+        """ Saving an object again updates its row """
+        state = State()
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Utah"
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.all(State)['State.' + state.id].name,
+                         "Utah")
+
+    def test_close_discards_unsaved(self):
+        """ Changes that were not saved are dropped by close() """
+        state = State()
+        self.storage.new(state)
+        self.assertIn('State.' + state.id, self.storage.all(State))
+        self.storage.close()
+        self.assertEqual(self.storage.all(State), {})
+
+    def test_delete(self):
+        """ Deleted objects disappear once saved """
+        state = State()
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.delete(state)
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.all(State), {})
+
+    def test_by_fk(self):
+        """ Foreign key lookups use the indexed columns """
+        state = State()
+        city = City()
+        city.state_id = state.id
+        other = City()
+        for obj in (state, city, other):
+            self.storage.new(obj)
+        self.storage.save()
+        self.assertEqual(list(self.storage.by_fk(City, 'state_id', state.id)),
+                         ['City.' + city.id])
+        plan = ' '.join(row[-1] for row in sqlite3.connect(self.path).execute(
+            'EXPLAIN QUERY PLAN SELECT data FROM objects '
+            'WHERE cls = ? AND state_id = ?', ('City', state.id)))
+        self.assertIn('objects_state_id', plan)
+
+    def test_query(self):
+        """ query() pushes filters, order and limits into SQL """
+        state = State()
+        self.storage.new(state)
+        for name in ["b", "d", "a", "c"]:
+            city = City()
+            city.name = name
+            city.state_id = state.id
+            self.storage.new(city)
+        self.storage.new(City())
+        self.storage.save()
+        self.storage.close()
+        result = [c.name for c in self.storage.query(
+            City, filters={'state_id': state.id}, order_by='-name',
+            limit=2, offset=1, batch_size=1)]
+        self.assertEqual(result, ["c", "b"])
+        result = [c.name for c in self.storage.query(
+            City, filters={'name': "a"})]
+        self.assertEqual(result, ["a"])
+
+    def test_get_and_count(self):
+        """ get(), get_many() and count() use the primary key """
+        states = [State() for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.new(City())
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.get(State, states[0].id).id,
+                         states[0].id)
+        self.assertIsNone(self.storage.get(City, states[0].id))
+        self.assertEqual(set(self.storage.get_many(
+            State, [s.id for s in states[:2]] + ['nope'])),
+            {'State.' + s.id for s in states[:2]})
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(State), 3)
+
+    def test_eager_load(self):
+        """ load= fetches relationships with a constant number of queries """
+        states = [State() for i in range(5)]
+        for state in states:
+            self.storage.new(state)
+            for i in range(3):
+                city = City()
+                city.state_id = state.id
+                self.storage.new(city)
+        self.storage.save()
+        self.storage.close()
+        with patch('models.storage', self.storage):
+            before = self.storage.query_count
+            for state in self.storage.all(State).values():
+                self.assertEqual(len(state.cities), 3)
+            lazy = self.storage.query_count - before
+            self.storage.close()
+            before = self.storage.query_count
+            for state in self.storage.query(State, load=['cities']):
+                self.assertEqual(len(state.cities), 3)
+            eager = self.storage.query_count - before
+        self.assertEqual(lazy, 1 + len(states))
+        self.assertEqual(eager, 2)
+
+    def test_bulk(self):
+        """ bulk_new and bulk_delete are written by one save """
+        states = [State() for i in range(5)]
+        self.storage.bulk_new(states)
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 5)
+        self.storage.bulk_delete(states[:3])
+        self.storage.save()
+        self.storage.close()
+        self.assertEqual(set(self.storage.all(State)),
+                         {'State.' + s.id for s in states[3:]})
+
+    def test_version(self):
+        """ version follows staged changes and commits from elsewhere """
+        version = self.storage.version
+        self.assertEqual(self.storage.version, version)
+        self.storage.new(State())
+        self.assertGreater(self.storage.version, version)
+        version = self.storage.version
+        with patch.dict(os.environ, {'HBNB_SQLITE_PATH': self.path}):
+            other = SQLiteStorage()
+        other.new(State())
+        other.save()
+        other.close()
+        self.assertGreater(self.storage.version, version)
+
+    def test_page(self):
+        """ page() walks a class in id order """
+        record = State().to_dict()
+        states = [State(**dict(record, id=str(i))) for i in range(5)]
+        self.storage.bulk_new(states + [City()])
+        self.storage.save()
+        self.assertEqual([s.id for s in self.storage.page(State, 3)],
+                         ['0', '1', '2'])
+        self.assertEqual([s.id for s in self.storage.page(State, 3, '2')],
+                         ['3', '4'])
+
+    def test_search_places(self):
+        """ search_places() filters on cities, states and amenities """
+        state = State()
+        city = City()
+        city.state_id = state.id
+        near, far = Place(), Place()
+        near.city_id = city.id
+        near.amenity_ids = ['wifi', 'pool']
+        far.amenity_ids = ['wifi']
+        self.storage.bulk_new([state, city, near, far])
+        self.assertEqual(len(self.storage.search_places(
+            amenities=['wifi'])), 2)
+        self.assertEqual(self.storage.search_places(
+            states=[state.id], amenities=['wifi']), [near])
+        self.assertEqual(self.storage.search_places(
+            cities=[city.id], amenities=['wifi', 'spa']), [])
+
+    def test_nearby(self):
+        """ nearby() measures the places of the bounding box """
+        near, far = Place(), Place()
+        near.latitude, near.longitude = 48.8606, 2.3376
+        far.latitude, far.longitude = 51.5074, -0.1278
+        self.storage.bulk_new([near, far])
+        found = self.storage.nearby(48.8566, 2.3522, 10)
+        self.assertEqual([p for d, p in found], [near])
+        self.assertEqual(len(self.storage.nearby(48.8566, 2.3522, 400)), 2)
+        conn = sqlite3.connect(self.path)
+        plan = ' '.join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM objects WHERE cls = 'Place' "
+            "AND json_extract(data, '$.latitude') BETWEEN 1 AND 2"))
+        conn.close()
+        self.assertIn('objects_latitude', plan)
+
+    def test_range_places(self):
+        """ range_places() filters ranges and cities and sorts in SQL """
+        city = City()
+        places = []
+        for price, guests in ((80, 2), (120, 4), (60, 6), (200, 8)):
+            place = Place()
+            place.city_id = city.id
+            place.price_by_night = price
+            place.max_guest = guests
+            places.append(place)
+        self.storage.bulk_new(places + [Place()])
+        found = self.storage.range_places({'max_guest': (4, None)},
+                                          [city.id], 'price_by_night', 2)
+        self.assertEqual(found, [places[2], places[1]])
+        found = self.storage.range_places({'price_by_night': (70, 150)},
+                                          order_by='-max_guest')
+        self.assertEqual(found, [places[1], places[0]])
+
+    def test_range_places_defaults(self):
+        """ range_places() returns the rows FileStorage would: unset
+        values are the class defaults and non-numbers never match """
+        unset, text = Place(), Place()
+        text.number_rooms = 'x'
+        self.storage.bulk_new([unset, text])
+        self.assertEqual(set(self.storage.range_places(
+            {'price_by_night': (0, 10)})), {unset, text})
+        self.assertEqual(self.storage.range_places(
+            {'number_rooms': (None, 0)}), [unset])
+        self.assertEqual(self.storage.range_places(
+            {'number_rooms': (1, None)}), [])
+        self.assertEqual(self.storage.range_places(
+            order_by='-number_rooms'), [unset])
+        conn = sqlite3.connect(self.path)
+        plan = str(conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM objects WHERE cls = 'Place' "
+            "AND COALESCE(json_extract(data, '$.price_by_night'), 0) < 5")
+            .fetchall())
+        conn.close()
+        self.assertIn('places_price_by_night', plan)
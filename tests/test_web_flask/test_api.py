@@ -0,0 +1,190 @@
+#!/usr/bin/python3
+""" Module for testing the JSON API and the /hbnb sections"""
+import importlib
+import os
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+try:
+    from web_flask import api, http_cache
+except ImportError:
+    api = None
+
+
+@unittest.skipIf(api is None, "Flask is not installed")
+class test_api(unittest.TestCase):
+    """ Class to test the paginated API and the page using it """
+
+    def setUp(self):
+        """ Start from 5 States and a User """
+        storage._FileStorage__objects.clear()
+        http_cache._pages.clear()
+        self.states = sorted((State() for i in range(5)),
+                             key=lambda state: state.id)
+        for i, state in enumerate(self.states):
+            state.name = "State {}".format(i)
+        self.user = User()
+        self.user.email = "a@b.c"
+        self.user.password = "secret"
+        storage.save()
+        app = importlib.import_module('web_flask.100-hbnb').app
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """ Remove the storage files and the text index """
+        for path in ('file.json', 'file.json.text'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        FileStorage._FileStorage__text = None
+
+    def test_pages(self):
+        """ Following next_cursor walks every object once, in id order """
+        ids, cursor = [], ''
+        while cursor is not None:
+            response = self.client.get(
+                '/api/v1/states?limit=2&cursor=' + cursor)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page['data']), 2)
+            ids += [record['id'] for record in page['data']]
+            cursor = page['next_cursor']
+        self.assertEqual(ids, [state.id for state in self.states])
+
+    def test_errors(self):
+        """ Bad cursors and limits get a 400, unknown resources a 404 """
+        for query in ('cursor=!!!', 'cursor=a', 'limit=0', 'limit=x',
+                      'limit=101'):
+            response = self.client.get('/api/v1/states?' + query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn('error', response.get_json())
+        self.assertEqual(self.client.get('/api/v1/nope').status_code, 404)
+
+    def test_hidden(self):
+        """ Passwords are not sent """
+        record = self.client.get('/api/v1/users').get_json()['data'][0]
+        self.assertEqual(record['email'], "a@b.c")
+        self.assertNotIn('password', record)
+
+    def test_hbnb_sections(self):
+        """ /hbnb shows the first page of each section and a cursor to
+        the next one """
+        for i in range(len(self.states), api.page_size + 1):
+            State().name = "State {}".format(i)
+        storage.save()
+        states = sorted(storage.all(State).values(),
+                        key=lambda state: state.id)
+        html = self.client.get('/hbnb').get_data(as_text=True)
+        for state in states[:-1]:
+            self.assertIn('<li>{}</li>'.format(state.name), html)
+        self.assertNotIn('<li>{}</li>'.format(states[-1].name), html)
+        cursor = api.encode_cursor(states[-2].id)
+        self.assertIn('data-resource="states"', html)
+        self.assertIn('data-cursor="{}"'.format(cursor), html)
+        self.assertNotIn('data-resource="users"', html)
+        page = self.client.get('/api/v1/states?cursor=' + cursor).get_json()
+        self.assertEqual(page, {'data': [states[-1].to_dict()],
+                                'next_cursor': None})
+
+    def test_places_search(self):
+        """ /places_search pages the Places of the states, cities and
+        amenities of the body, and checks the body """
+        city = City()
+        city.state_id = self.states[0].id
+        places = sorted((Place() for i in range(3)), key=lambda p: p.id)
+        for place in places:
+            place.city_id = city.id
+            place.amenity_ids = ['wifi']
+        places[1].amenity_ids = ['wifi', 'pool']
+        storage.save()
+        url = '/api/v1/places_search'
+        page = self.client.post(url + '?limit=2', json={}).get_json()
+        self.assertEqual([r['id'] for r in page['data']],
+                         [p.id for p in places[:2]])
+        page = self.client.post(url + '?cursor=' + page['next_cursor'],
+                                json={}).get_json()
+        self.assertEqual([r['id'] for r in page['data']], [places[2].id])
+        body = {'states': [self.states[0].id], 'cities': None,
+                'amenities': ['pool']}
+        page = self.client.post(url, json=body).get_json()
+        self.assertEqual([r['id'] for r in page['data']], [places[1].id])
+        page = self.client.post(url, json={'cities': [self.states[1].id]})
+        self.assertEqual(page.get_json()['data'], [])
+        for body in ({'states': 5}, {'cities': [['x']]},
+                     {'amenities': [{}]}, {'amenities': 'a'}, [1]):
+            response = self.client.post(url, json=body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn('error', response.get_json())
+
+    def test_places_nearby(self):
+        """ /places_nearby lists the Places within radius, nearest first,
+        and checks the position and radius """
+        near, far = Place(), Place()
+        near.latitude, near.longitude = 48.8566, 2.3522
+        far.latitude, far.longitude = 48.8566, 2.5
+        storage.save()
+        url = '/api/v1/places_nearby?lat=48.8566&lon=2.3522'
+        data = self.client.get(url + '&radius=20').get_json()['data']
+        self.assertEqual([r['id'] for r in data], [near.id, far.id])
+        self.assertEqual(data[0]['distance_km'], 0)
+        data = self.client.get(url + '&radius=1').get_json()['data']
+        self.assertEqual([r['id'] for r in data], [near.id])
+        for args in ('lat=1', 'lat=91&lon=0', 'lat=nan&lon=0',
+                     'lat=0&lon=0&radius=-1', 'lat=0&lon=0&radius=nan',
+                     'lat=0&lon=0&radius=inf', 'lat=0&lon=0&limit=x'):
+            response = self.client.get('/api/v1/places_nearby?' + args)
+            self.assertEqual(response.status_code, 400, args)
+
+    def test_places_range(self):
+        """ /places_range filters the Places on ranges and cities, sorted
+        by order_by, and checks its arguments """
+        city = City()
+        places = [Place() for i in range(4)]
+        for price, place in zip((50, 150, 100, 300), places):
+            place.price_by_night = price
+            place.city_id = city.id
+        places[3].city_id = 'elsewhere'
+        storage.save()
+        url = '/api/v1/places_range?price_by_night=60:'
+        data = self.client.get(url + '&order_by=-price_by_night').get_json()
+        self.assertEqual([r['id'] for r in data['data']],
+                         [places[i].id for i in (3, 1, 2)])
+        data = self.client.get(url + '&order_by=price_by_night&cities=' +
+                               city.id + '&limit=1').get_json()
+        self.assertEqual([r['id'] for r in data['data']], [places[2].id])
+        data = self.client.get('/api/v1/places_range?price_by_night=:100'
+                               '&order_by=price_by_night').get_json()
+        self.assertEqual([r['id'] for r in data['data']],
+                         [places[0].id, places[2].id])
+        for args in ('price_by_night=a:1', 'price_by_night=nan:',
+                     'order_by=name', 'limit=0'):
+            response = self.client.get('/api/v1/places_range?' + args)
+            self.assertEqual(response.status_code, 400, args)
+
+    def test_search(self):
+        """ /search ranks objects, or answers 501 when the engine cannot """
+        response = self.client.get('/api/v1/search?q=state+3&types=states')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['data'][0]['id'],
+                         self.states[3].id)
+        with patch.object(api, 'storage', object()):
+            response = self.client.get('/api/v1/search?q=state')
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('error', response.get_json())
+
+    def test_create_app(self):
+        """ The whole site serves the pages of every script and the API """
+        from web_flask import create_app
+        client = create_app().test_client()
+        self.assertEqual(client.get('/').data, b'Hello HBNB!')
+        self.assertEqual(client.get('/c/is_fun').data, b'C is fun')
+        self.assertIn(b'is odd', client.get('/number_odd_or_even/3').data)
+        self.assertIn(b'State 0', client.get('/states_list').data)
+        self.assertIn(b'<section id="states">', client.get('/hbnb').data)
+        self.assertEqual(client.get('/api/v1/states').status_code, 200)
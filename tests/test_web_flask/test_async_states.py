@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+""" Module for testing the async states pages"""
+import asyncio
+import importlib
+import os
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.city import City
+from models.state import State
+try:
+    async_states = importlib.import_module('web_flask.11-async_states')
+except ImportError:
+    async_states = None
+
+
+@unittest.skipIf(async_states is None, "Quart is not installed")
+class test_asyncStates(unittest.TestCase):
+    """ Class to test that the pages make no storage call on the loop """
+
+    def setUp(self):
+        """ Start from a State with a City """
+        storage._FileStorage__objects.clear()
+        self.state = State()
+        self.state.name = "Ohio"
+        self.city = City()
+        self.city.name = "Akron"
+        self.city.state_id = self.state.id
+        storage.save()
+
+    def tearDown(self):
+        """ Remove storage file at end of tests """
+        try:
+            os.remove('file.json')
+        except FileNotFoundError:
+            pass
+
+    def get(self, path):
+        """ Returns the text of the page at path, failing if a template
+        reads State.cities """
+        async def scenario():
+            client = async_states.app.test_client()
+            response = await client.get(path)
+            return await response.get_data(as_text=True)
+        with patch.object(State, 'cities', property(lambda self: 1 / 0)):
+            return asyncio.run(scenario())
+
+    def test_cities_by_states(self):
+        """ The cities are read with the States """
+        self.assertIn('Akron', self.get('/cities_by_states'))
+
+    def test_state_cities(self):
+        """ The cities of a State are read before rendering """
+        self.assertIn('Akron', self.get('/states/' + self.state.id))
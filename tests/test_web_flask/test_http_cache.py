@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+""" Module for testing the HTTP caching of the pages"""
+import importlib
+import os
+import unittest
+from unittest.mock import patch
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+try:
+    from web_flask import http_cache
+except ImportError:
+    http_cache = None
+
+
+@unittest.skipIf(http_cache is None, "Flask is not installed")
+class test_httpCache(unittest.TestCase):
+    """ Class to test ETags, 304s and the page cache """
+
+    def setUp(self):
+        """ Start from an empty storage and page cache """
+        storage._FileStorage__objects.clear()
+        http_cache._pages.clear()
+        self.state = State()
+        self.state.name = "California"
+        storage.save()
+        app = importlib.import_module('web_flask.9-states').app
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """ Remove the storage files and the text index """
+        for path in ('file.json', 'file.json.text'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        FileStorage._FileStorage__text = None
+
+    def test_etag_and_304(self):
+        """ A request holding the current ETag gets an empty 304 """
+        response = self.client.get('/states')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'California', response.data)
+        etag = response.headers['ETag']
+        response = self.client.get('/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_write_changes_etag(self):
+        """ A write changes the ETag and the page """
+        etag = self.client.get('/states').headers['ETag']
+        State().name = "Nevada"
+        storage.save()
+        response = self.client.get('/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertIn(b'Nevada', response.data)
+
+    def test_page_cache(self):
+        """ The HTML of a version is rendered once """
+        first = self.client.get('/states').data
+        with patch('flask.templating._render') as render:
+            self.assertEqual(self.client.get('/states').data, first)
+        render.assert_not_called()
+
+    def test_reset(self):
+        """ A forked worker takes a new token and an empty cache """
+        etag = self.client.get('/states').headers['ETag']
+        http_cache.reset()
+        self.assertEqual(http_cache._pages, {})
+        response = self.client.get('/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_disabled(self):
+        """ HBNB_HTTP_CACHE=0 and the db engine turn the cache off """
+        with patch.object(http_cache, 'enabled', False):
+            response = self.client.get('/states')
+        self.assertIsNone(response.headers.get('ETag'))
+        self.assertEqual(http_cache._pages, {})
+        for env in ({'HBNB_HTTP_CACHE': '0'}, {'HBNB_TYPE_STORAGE': 'db'}):
+            with patch.dict(os.environ, env):
+                importlib.reload(http_cache)
+                self.assertFalse(http_cache.enabled)
+        importlib.reload(http_cache)
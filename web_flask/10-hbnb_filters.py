@@ -1,21 +1,27 @@
 #!/usr/bin/python3
 """Flask web application for AirBnB clone"""
-from flask import Flask, render_template
+from flask import Blueprint, Flask, render_template
 from models import storage
 from models.state import State
 from models.amenity import Amenity
+from web_flask.http_cache import cached_page
 
-app = Flask(__name__)
+routes = Blueprint('hbnb_filters', __name__)
 
 
-@app.route('/hbnb_filters', strict_slashes=False)
+@routes.route('/hbnb_filters', strict_slashes=False)
+@cached_page
 def hbnb_filters():
     """Display a HTML page with States, Cities and Amenities filters"""
-    states = sorted(storage.all(State).values(), key=lambda x: x.name)
-    amenities = sorted(storage.all(Amenity).values(), key=lambda x: x.name)
+    states = storage.query(State, order_by='name')
+    amenities = storage.query(Amenity, order_by='name')
     return render_template('10-hbnb_filters.html', states=states, amenities=amenities)
 
 
+app = Flask(__name__)
+app.register_blueprint(routes)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """Remove the current SQLAlchemy Session"""
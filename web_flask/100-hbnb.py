@@ -2,17 +2,32 @@
 """
 Flask application that defines the routes for the AirBnB clone
 """
-from flask import Flask, render_template
+from flask import Blueprint, Flask
 from models import storage
-from models.state import State
-from models.city import City
-from models.amenity import Amenity
-from models.place import Place
-from models.review import Review
-from models.user import User
+from web_flask.api import api, fetch_page, resources
+from web_flask.http_cache import cached_page
+from web_flask.streaming import stream_page
+
+
+routes = Blueprint('hbnb', __name__)
+
+
+@routes.route('/hbnb', strict_slashes=False)
+@cached_page
+def hbnb():
+    """Displays the first page of each section of the HBNB page; the
+    rest is fetched from the API on demand
+
+    The page is streamed, each section being read from storage when the
+    template gets to it.
+    """
+    sections = ((name, fetch_page(cls)) for name, cls in resources.items())
+    return stream_page('100-hbnb.html', sections=sections)
 
 
 app = Flask(__name__)
+app.register_blueprint(routes)
+app.register_blueprint(api)
 
 
 @app.teardown_appcontext
@@ -21,20 +36,5 @@ def teardown_db(exception):
     storage.close()
 
 
-@app.route('/hbnb', strict_slashes=False)
-def hbnb():
-    """Displays the HBNB page"""
-    states = storage.all(State).values()
-    cities = storage.all(City).values()
-    amenities = storage.all(Amenity).values()
-    places = storage.all(Place).values()
-    reviews = storage.all(Review).values()
-    users = storage.all(User).values()
-    return render_template('100-hbnb.html',
-                           states=states, cities=cities,
-                           amenities=amenities, places=places,
-                           reviews=reviews, users=users)
-
-
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=5000, debug=True)
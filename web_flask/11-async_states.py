@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""Async version of the states pages, served by Quart
+
+Quart keeps the Flask API but runs the views as coroutines on one event
+loop, so a request waiting on storage does not hold up the others. Run
+it with an ASGI server, e.g. hypercorn 'web_flask.11-async_states:app'.
+"""
+from quart import Quart, render_template
+from models.city import City
+from models.engine.async_storage import open_storage
+from models.state import State
+
+app = Quart(__name__)
+storage = open_storage()
+
+
+@app.before_serving
+async def open_db():
+    """Load the storage before the first request"""
+    await storage.reload()
+
+
+@app.route('/states_list', strict_slashes=False)
+async def states_list():
+    """Display a HTML page with the list of all State objects"""
+    states = await storage.query(State, order_by='name')
+    return await render_template('7-states_list.html', states=states)
+
+
+def states_with_cities(engine):
+    """Returns the States by name and their cities by State id, read in
+    one session so that the cities come from the prefetch of the States"""
+    states = list(engine.query(State, order_by='name', load=['cities']))
+    return states, {state.id: list(engine.by_fk(City, 'state_id',
+                                                state.id).values())
+                    for state in states}
+
+
+@app.route('/cities_by_states', strict_slashes=False)
+async def cities_by_states():
+    """Display a HTML page with all State objects and their cities"""
+    states, cities = await storage.run(states_with_cities)
+    return await render_template('8-cities_by_states.html', states=states,
+                                 cities=cities)
+
+
+@app.route('/states/<id>', strict_slashes=False)
+async def state_cities(id):
+    """Display a HTML page with the cities of a specific State"""
+    state = await storage.get(State, id)
+    if state:
+        cities = await storage.by_fk(City, 'state_id', id)
+        return await render_template('9-states.html', state=state,
+                                     cities=list(cities.values()))
+    return await render_template('9-states.html', not_found=True)
+
+
+@app.teardown_appcontext
+async def teardown_db(exception):
+    """Remove the session of the request"""
+    await storage.close()
+
+
+if __name__ == "__main__":
+    app.run(host='0.0.0.0', port=5000)
@@ -1,52 +1,57 @@
 #!/usr/bin/python3
 """Flask web application for AirBnB clone"""
-from flask import Flask, render_template
+from flask import Blueprint, Flask, render_template
 
-app = Flask(__name__)
+routes = Blueprint('number_odd_or_even', __name__)
 
 
-@app.route('/', strict_slashes=False)
+@routes.route('/', strict_slashes=False)
 def hello_hbnb():
     """Display 'Hello HBNB!'"""
     return 'Hello HBNB!'
 
 
-@app.route('/hbnb', strict_slashes=False)
+@routes.route('/hbnb', strict_slashes=False)
 def hbnb():
     """Display 'HBNB'"""
     return 'HBNB'
 
 
-@app.route('/c/<text>', strict_slashes=False)
+@routes.route('/c/<text>', strict_slashes=False)
 def c_route(text):
     """Display 'C ' followed by the value of text"""
     return 'C ' + text.replace('_', ' ')
 
 
-@app.route('/python/', defaults={'text': 'is cool'}, strict_slashes=False)
-@app.route('/python/<text>', strict_slashes=False)
+@routes.route('/python/', defaults={'text': 'is cool'}, strict_slashes=False)
+@routes.route('/python/<text>', strict_slashes=False)
 def python_route(text):
     """Display 'Python ' followed by the value of text"""
     return 'Python ' + text.replace('_', ' ')
 
 
-@app.route('/number/<int:n>', strict_slashes=False)
+@routes.route('/number/<int:n>', strict_slashes=False)
 def number_route(n):
     """Display 'n is a number' only if n is an integer"""
     return f'{n} is a number'
 
 
-@app.route('/number_template/<int:n>', strict_slashes=False)
+@routes.route('/number_template/<int:n>', strict_slashes=False)
 def number_template(n):
     """Display a HTML page only if n is an integer"""
     return render_template('5-number.html', n=n)
 
 
-@app.route('/number_odd_or_even/<int:n>', strict_slashes=False)
+@routes.route('/number_odd_or_even/<int:n>', strict_slashes=False)
 def number_odd_or_even(n):
     """Display a HTML page only if n is an integer"""
     odd_or_even = "odd" if n % 2 else "even"
-    return render_template('6-number_odd_or_even.html', n=n, odd_or_even=odd_or_even)
+    return render_template('6-number_odd_or_even.html', n=n,
+                           odd_or_even=odd_or_even)
+
+
+app = Flask(__name__)
+app.register_blueprint(routes)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,23 @@
 #!/usr/bin/python3
 """Flask web application for AirBnB clone"""
-from flask import Flask, render_template
+from flask import Blueprint, Flask, render_template
 from models import storage
 from models.state import State
 
-app = Flask(__name__)
+routes = Blueprint('states_list', __name__)
 
 
-@app.route('/states_list', strict_slashes=False)
+@routes.route('/states_list', strict_slashes=False)
 def states_list():
     """Display a HTML page with the list of all State objects"""
-    states = sorted(storage.all(State).values(), key=lambda x: x.name)
+    states = storage.query(State, order_by='name')
     return render_template('7-states_list.html', states=states)
 
 
+app = Flask(__name__)
+app.register_blueprint(routes)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """Remove the current SQLAlchemy Session"""
@@ -1,17 +1,27 @@
 #!/usr/bin/python3
 """Flask web application for AirBnB clone"""
-from flask import Flask, render_template
+from flask import Blueprint, Flask
 from models import storage
 from models.state import State
+from web_flask.http_cache import cached_page
+from web_flask.streaming import stream_page
 
-app = Flask(__name__)
+routes = Blueprint('cities_by_states', __name__)
 
 
-@app.route('/cities_by_states', strict_slashes=False)
+@routes.route('/cities_by_states', strict_slashes=False)
+@cached_page
 def cities_by_states():
-    """Display a HTML page with the list of all State objects and their cities"""
-    states = sorted(storage.all(State).values(), key=lambda x: x.name)
-    return render_template('8-cities_by_states.html', states=states)
+    """Display a HTML page with the list of all State objects and their cities
+
+    The page is streamed while the states are read from storage.
+    """
+    states = storage.query(State, order_by='name', load=['cities'])
+    return stream_page('8-cities_by_states.html', states=states)
+
+
+app = Flask(__name__)
+app.register_blueprint(routes)
 
 
 @app.teardown_appcontext
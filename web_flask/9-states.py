@@ -1,29 +1,35 @@
 #!/usr/bin/python3
 """Flask web application for AirBnB clone"""
-from flask import Flask, render_template
+from flask import Blueprint, Flask, render_template
 from models import storage
 from models.state import State
+from web_flask.http_cache import cached_page
 
-app = Flask(__name__)
+routes = Blueprint('states', __name__)
 
 
-@app.route('/states', strict_slashes=False)
+@routes.route('/states', strict_slashes=False)
+@cached_page
 def states_list():
     """Display a HTML page with the list of all State objects"""
-    states = sorted(storage.all(State).values(), key=lambda x: x.name)
+    states = storage.query(State, order_by='name')
     return render_template('9-states.html', states=states)
 
 
-@app.route('/states/<id>', strict_slashes=False)
+@routes.route('/states/<id>', strict_slashes=False)
+@cached_page
 def state_cities(id):
     """Display a HTML page with the cities of a specific State"""
-    states = storage.all(State)
-    state = states.get(f"State.{id}")
+    state = storage.get(State, id)
     if state:
         return render_template('9-states.html', state=state)
     return render_template('9-states.html', not_found=True)
 
 
+app = Flask(__name__)
+app.register_blueprint(routes)
+
+
 @app.teardown_appcontext
 def teardown_db(exception):
     """Remove the current SQLAlchemy Session"""
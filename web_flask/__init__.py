@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Flask web application for AirBnB clone
+
+create_app() builds the whole site as one app from the blueprints of the
+page scripts. The scripts still run on their own.
+"""
+import importlib
+from flask import Flask
+
+pages = ('7-states_list', '8-cities_by_states', '9-states',
+         '10-hbnb_filters', '100-hbnb', '6-number_odd_or_even')
+
+
+def create_app():
+    """Returns the app serving every page and the JSON API
+
+    6-number_odd_or_even holds the routes of scripts 0 to 6. It is
+    registered after 100-hbnb, so /hbnb is the HBNB page rather than the
+    'HBNB' text of the first scripts.
+    """
+    from models import storage
+    from web_flask.api import api
+
+    app = Flask(__name__)
+    for name in pages:
+        app.register_blueprint(
+            importlib.import_module('web_flask.' + name).routes)
+    app.register_blueprint(api)
+
+    @app.teardown_appcontext
+    def teardown_db(exception):
+        """Closes the storage on teardown"""
+        storage.close()
+
+    return app
@@ -0,0 +1,220 @@
+#!/usr/bin/python3
+"""JSON API over storage, paginated with cursors
+
+GET /api/v1/<resource>?limit=&cursor= returns {"data": [...],
+"next_cursor": ...}. Objects are listed in id order and the cursor is
+an opaque encoding of the last id of the page, so every request reads
+at most one page from storage whatever the size of the data.
+
+POST /api/v1/places_search with {"states": [...], "cities": [...],
+"amenities": [...]} pages through storage.search_places() the same way,
+GET /api/v1/places_nearby?lat=&lon=&radius=&limit= lists the nearest
+Places from storage.nearby(), and GET /api/v1/search?q=&types=&limit=
+ranks objects with storage.search_text(). GET /api/v1/places_range
+filters and sorts Places with storage.range_places().
+"""
+import base64
+import binascii
+import bisect
+import math
+from flask import Blueprint, jsonify, request
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import range_fields
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+resources = {'states': State, 'cities': City, 'amenities': Amenity,
+             'places': Place, 'reviews': Review, 'users': User}
+page_size = 20
+max_page_size = 100
+hidden = ('password',)
+
+
+def encode_cursor(id):
+    """Returns the cursor of the page that follows the object id"""
+    return base64.urlsafe_b64encode(id.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Returns the id encoded in cursor; raises binascii.Error if it is
+    not URL-safe base64"""
+    return base64.b64decode(cursor + '=' * (-len(cursor) % 4),
+                            altchars=b'-_', validate=True).decode()
+
+
+def fetch_page(cls, limit=page_size, after=None):
+    """Returns a page of objects of cls and the cursor of the next one,
+    or None on the last page"""
+    return paginate(storage.page(cls, limit + 1, after), limit)
+
+
+def paginate(objs, limit):
+    """Splits a list of up to limit + 1 objects into a page and the
+    cursor of the next one"""
+    if len(objs) > limit:
+        return objs[:limit], encode_cursor(objs[limit - 1].id)
+    return objs, None
+
+
+def limit_arg():
+    """Returns the limit argument of the request, checked"""
+    try:
+        limit = int(request.args.get('limit', page_size))
+    except ValueError:
+        limit = 0
+    if not 0 < limit <= max_page_size:
+        raise ValueError("limit must be between 1 and {}".format(
+            max_page_size))
+    return limit
+
+
+def page_args():
+    """Returns the limit and the last id before the requested page"""
+    limit = limit_arg()
+    if not request.args.get('cursor'):
+        return limit, None
+    try:
+        return limit, decode_cursor(request.args['cursor'])
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def id_list(body, name):
+    """Returns the ids under name in a JSON body, none if it is missing
+    or null; raises ValueError if they are not a list of strings"""
+    ids = body.get(name)
+    if ids is None:
+        return []
+    if not isinstance(ids, list) or not all(
+            isinstance(id, str) for id in ids):
+        raise ValueError("{} must be a list of ids".format(name))
+    return ids
+
+
+def public(obj):
+    """Returns the dictionary of obj without its hidden attributes"""
+    record = obj.to_dict()
+    for name in hidden:
+        record.pop(name, None)
+    return record
+
+
+@api.route('/<resource>', strict_slashes=False)
+def list_objects(resource):
+    """Returns one page of the objects of a resource as JSON"""
+    cls = resources.get(resource)
+    if cls is None:
+        return jsonify(error="Not found"), 404
+    try:
+        limit, after = page_args()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    objs, cursor = fetch_page(cls, limit, after)
+    return jsonify(data=[public(obj) for obj in objs], next_cursor=cursor)
+
+
+@api.route('/places_search', methods=['POST'], strict_slashes=False)
+def places_search():
+    """Returns one page of the Places in the states and cities of the
+    JSON body, or anywhere, that have all of its amenities"""
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify(error="Not a JSON"), 400
+    try:
+        states, cities, amenities = (id_list(body, name) for name in
+                                     ('states', 'cities', 'amenities'))
+        limit, after = page_args()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    places = storage.search_places(states, cities, amenities)
+    start = 0
+    if after is not None:
+        start = bisect.bisect_right([place.id for place in places], after)
+    objs, cursor = paginate(places[start:start + limit + 1], limit)
+    return jsonify(data=[public(obj) for obj in objs], next_cursor=cursor)
+
+
+@api.route('/places_nearby', strict_slashes=False)
+def places_nearby():
+    """Returns the Places within radius km of (lat, lon), nearest first,
+    each with its distance_km"""
+    try:
+        lat = float(request.args['lat'])
+        lon = float(request.args['lon'])
+        radius = float(request.args.get('radius', 10))
+    except (KeyError, ValueError):
+        return jsonify(error="lat and lon are required numbers"), 400
+    if (not -90 <= lat <= 90 or not -180 <= lon <= 180 or
+            not math.isfinite(radius) or radius < 0):
+        return jsonify(error="Invalid position or radius"), 400
+    try:
+        limit = limit_arg()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    data = []
+    for distance, place in storage.nearby(lat, lon, radius, limit):
+        record = public(place)
+        record['distance_km'] = round(distance, 3)
+        data.append(record)
+    return jsonify(data=data)
+
+
+@api.route('/search', strict_slashes=False)
+def search():
+    """Returns the objects best matching the words of q, best first,
+    each with its score; types restricts them to some resources, and
+    engines without search_text answer 501"""
+    search_text = getattr(storage, 'search_text', None)
+    if search_text is None:
+        return jsonify(error="Full-text search is not supported by the "
+                       "storage engine"), 501
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify(error="q is required"), 400
+    names = None
+    if request.args.get('types'):
+        try:
+            names = {resources[name].__name__
+                     for name in request.args['types'].split(',')}
+        except KeyError:
+            return jsonify(error="Unknown type"), 400
+    try:
+        limit = limit_arg()
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    data = []
+    for score, obj in search_text(query, names, limit):
+        record = public(obj)
+        record['score'] = round(score, 4)
+        data.append(record)
+    return jsonify(data=data)
+
+
+@api.route('/places_range', strict_slashes=False)
+def places_range():
+    """Returns the Places whose numeric attributes fall in the ranges
+    given as attribute=low:high, in the cities given as cities=a,b,
+    sorted by order_by"""
+    ranges = {}
+    try:
+        for name in range_fields['Place']:
+            if name in request.args:
+                low, _, high = request.args[name].partition(':')
+                bounds = tuple(float(b) if b else None for b in (low, high))
+                if any(b is not None and math.isnan(b) for b in bounds):
+                    raise ValueError
+                ranges[name] = bounds
+        limit = limit_arg()
+    except ValueError as e:
+        return jsonify(error=str(e) or "Invalid range"), 400
+    order_by = request.args.get('order_by')
+    if order_by and order_by.lstrip('-') not in range_fields['Place']:
+        return jsonify(error="Invalid order_by"), 400
+    cities = [c for c in request.args.get('cities', '').split(',') if c]
+    places = storage.range_places(ranges, cities, order_by, limit)
+    return jsonify(data=[public(place) for place in places])
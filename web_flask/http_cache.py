@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""HTTP caching of the pages rendered from storage
+
+A page decorated with cached_page gets a strong ETag made of a token of
+this process and storage.version, so it changes whenever the data may
+have changed. A request whose If-None-Match holds the current ETag gets
+a 304 without rendering anything; other requests reuse the HTML
+rendered for the current version, if any. A streamed page is cached
+once it has been sent whole. HBNB_HTTP_CACHE=0 turns both off. They
+are always off with HBNB_TYPE_STORAGE=db: DBStorage has no version, and
+the writes another process makes to the database could not be seen.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from os import getenv
+from flask import make_response, request
+from models import storage
+
+enabled = (getenv('HBNB_HTTP_CACHE', '1') == '1' and
+           getenv('HBNB_TYPE_STORAGE') != 'db')
+max_pages = int(getenv('HBNB_HTTP_CACHE_PAGES', '256'))
+token = uuid.uuid4().hex[:8]
+_pages = OrderedDict()
+_lock = threading.Lock()
+
+
+def reset():
+    """Starts a new ETag token and empties the page cache
+
+    A forked worker calls it: its storage.version moves on its own, so an
+    ETag made with the token of its parent could name different data in
+    another worker.
+    """
+    global token
+    token = uuid.uuid4().hex[:8]
+    with _lock:
+        _pages.clear()
+
+
+def cached_page(view):
+    """Decorates a view rendering a page from storage"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return view(*args, **kwargs)
+        version = storage.version
+        etag = '{}-{}'.format(token, version)
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+        key = (view.__name__, request.path)
+        with _lock:
+            page = _pages.get(key)
+            if page is not None and page[0] == version:
+                _pages.move_to_end(key)
+        if page is not None and page[0] == version:
+            response = make_response(page[1])
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.is_streamed:
+                response.response = _tee(response.response, key, version)
+            else:
+                _store(key, version, response.get_data(as_text=True))
+        response.set_etag(etag)
+        return response
+    return wrapper
+
+
+def _store(key, version, html):
+    """Caches the HTML of a page for a storage version"""
+    with _lock:
+        _pages[key] = (version, html)
+        _pages.move_to_end(key)
+        while len(_pages) > max_pages:
+            _pages.popitem(last=False)
+
+
+def _tee(chunks, key, version):
+    """Yields the chunks of a streamed page, and caches the page once
+    it was sent whole"""
+    sent = []
+    try:
+        for chunk in chunks:
+            sent.append(chunk)
+            yield chunk
+        if sent:
+            html = sent[0][:0].join(sent)
+            _store(key, version, html if isinstance(html, str)
+                   else html.decode())
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""Pre-fork server of the whole web app
+
+The parent loads storage, builds every object and index of it, then
+forks workers that accept connections on one shared listening socket.
+Workers read the snapshot loaded by the parent, shared copy-on-write;
+gc.freeze() keeps the collector from writing to, and so copying, its
+objects. Writes made by a worker stay in that worker, so workers are
+meant to serve reads; each worker takes its own ETag token, as the
+storage versions of two workers do not name the same data.
+
+SIGHUP makes the parent reload storage and replace every worker with
+one forked from the new snapshot; old workers finish the request they
+are handling. SIGTERM or SIGINT stop the parent and its workers. A
+worker that dies is replaced.
+
+Usage: python3 -m web_flask.prefork [workers] [port]
+"""
+import gc
+import os
+import signal
+import sys
+import traceback
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+from models import storage
+from web_flask import create_app, http_cache
+
+watched = {signal.SIGCHLD, signal.SIGHUP, signal.SIGINT, signal.SIGTERM}
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Request handler that does not log every request"""
+
+    def log_message(self, format, *args):
+        """Logs nothing"""
+
+
+def snapshot():
+    """Loads storage in full and freezes it for the workers to share"""
+    gc.unfreeze()
+    storage.reload()
+    warm = getattr(storage, 'warm', None)
+    if warm is not None:
+        warm()
+    storage.close()
+    gc.collect()
+    gc.freeze()
+
+
+def spawn(server):
+    """Forks a worker serving server, and returns its pid"""
+    pid = os.fork()
+    if pid:
+        return pid
+    try:
+        http_cache.reset()
+        after_fork = getattr(storage, 'after_fork', None)
+        if after_fork is not None:
+            after_fork()
+        work(server)
+    except BaseException:
+        traceback.print_exc()
+        os._exit(1)
+    os._exit(0)
+
+
+def work(server):
+    """Handles requests until told to stop"""
+    stopping = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda sig, frame: stopping.append(sig))
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, watched)
+    server.timeout = 0.5
+    while not stopping:
+        server.handle_request()
+
+
+def serve(workers=4, host='0.0.0.0', port=5000):
+    """Runs workers processes serving the app on host:port"""
+    server = make_server(host, port, create_app(),
+                         handler_class=QuietHandler)
+    # workers race for each connection; the losers must not block
+    server.socket.setblocking(False)
+    signal.pthread_sigmask(signal.SIG_BLOCK, watched)
+    snapshot()
+    pids = {spawn(server) for _ in range(workers)}
+    while True:
+        sig = signal.sigwait(watched)
+        if sig == signal.SIGCHLD:
+            while True:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if not pid:
+                    break
+                if pid in pids:
+                    pids.remove(pid)
+                    pids.add(spawn(server))
+        elif sig == signal.SIGHUP:
+            snapshot()
+            old, pids = pids, {spawn(server) for _ in range(workers)}
+            for pid in old:
+                os.kill(pid, signal.SIGTERM)
+        else:
+            for pid in pids:
+                os.kill(pid, signal.SIGTERM)
+            for pid in pids:
+                os.waitpid(pid, 0)
+            server.server_close()
+            return
+
+
+if __name__ == "__main__":
+    serve(int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count(),
+          port=int(sys.argv[2]) if len(sys.argv) > 2 else 5000)
@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+"""Streamed rendering of the pages built from storage
+
+stream_page renders a template with Jinja's streaming API, so the
+response goes out a few KiB at a time while the template is still
+iterating over storage, instead of being built whole in memory first.
+"""
+from flask import Response, current_app, stream_with_context
+
+buffer_size = 64
+
+
+def stream_page(template_name, **context):
+    """Returns a response streaming template_name rendered with context"""
+    app = current_app._get_current_object()
+    template = app.jinja_env.get_template(template_name)
+    app.update_template_context(context)
+    stream = template.stream(context)
+    stream.enable_buffering(buffer_size)
+    return Response(stream_with_context(stream), mimetype='text/html')